@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+#
+#  TeachTime benchmarks and checks.
+#  Created by LulzLoL231 at 2026/10/18
+#
+#  Usage: python bench.py <name>, "plans" fails if hot lookups not uses index.
+#
+import io
+import os
+import sys
+import time
+import asyncio
+import resource
+import datetime
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from pymorphy2 import MorphAnalyzer
+
+import utils
+from config import Config
+
+
+# zamena encoding before profiles.
+OLD_PROFILE = {'dpi': 100, 'mode': 'RGB', 'format': 'JPEG', 'quality': 75}
+
+
+def measure(func, repeat: int) -> float:
+    '''measure: returns mean seconds per func call.
+
+    Args:
+        func (callable): function without args.
+        repeat (int): calls count.
+
+    Returns:
+        float: mean seconds per call.
+    '''
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def report(name: str, secs: float) -> None:
+    '''report: prints benchmark result.
+
+    Args:
+        name (str): benchmark name.
+        secs (float): seconds per call.
+    '''
+    print(f'{name:<48} {secs * 1000:>12.4f} ms')
+
+
+def benchMorph() -> None:
+    '''benchMorph: per-call cost of morphology helpers, old way vs shared analyzer with memo cache.
+    '''
+    report('MorphAnalyzer() (old per-word cost)', measure(MorphAnalyzer, 3))
+    start = time.perf_counter()
+    utils.getMorph()
+    report('getMorph() first call (dictionaries load)', time.perf_counter() - start)
+    report('getMorph()', measure(utils.getMorph, 100000))
+    report('getGentLessonName() cold', measure(lambda: (utils.inflectWord.cache_clear(),
+                                                        utils.getGentLessonName('Высшая математика')), 100))
+    report('getGentLessonName() memo', measure(lambda: utils.getGentLessonName('Высшая математика'), 100000))
+    start = time.perf_counter()
+    utils.getAgreeTable()
+    report('getAgreeTable() build (0-59)', time.perf_counter() - start)
+    td = datetime.timedelta(hours=1, minutes=23, seconds=45)
+    report('getLessonEt()', measure(lambda: utils.getLessonEt(td=td), 100000))
+
+
+def renderWhole(path: str, pages_dir: str, profile: dict, timeout: int) -> int:
+    '''renderWhole: old zamena render: all pages decoded at once, each copied through BytesIO.
+    '''
+    from pdf2image import convert_from_bytes
+    with open(path, 'rb') as f:
+        images = convert_from_bytes(f.read(), profile['dpi'], timeout=timeout)
+    pages = []
+    for img in images:
+        buf = io.BytesIO()
+        img.save(buf, 'JPEG')
+        pages.append(io.BytesIO(buf.getvalue()))
+    return len(pages)
+
+
+def runRender(func, path: str, pages_dir: str, profile: dict) -> tuple:
+    '''runRender: runs render function, in fresh worker process.
+
+    Args:
+        func (callable): render function (path, pages_dir, profile, timeout).
+        path (str): PDF path.
+        pages_dir (str): output directory.
+        profile (dict): encoding profile.
+
+    Returns:
+        tuple: seconds, worker peak RSS (MB), poppler peak RSS (MB).
+    '''
+    start = time.perf_counter()
+    func(path, pages_dir, profile, 60)
+    secs = time.perf_counter() - start
+    return (secs, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+            resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024)
+
+
+def makeSamplePdf(path: str, count: int = 10) -> str:
+    '''makeSamplePdf: writes zamena-like PDF: A4 pages with text table.
+
+    Args:
+        path (str): PDF path.
+        count (int, optional): pages count. Defaults to 10.
+
+    Returns:
+        str: PDF path.
+    '''
+    from PIL import Image, ImageDraw
+    pages = []
+    for num in range(count):
+        img = Image.new('RGB', (1240, 1754), 'white')
+        draw = ImageDraw.Draw(img)
+        draw.text((100, 60), f'ZAMENA 19.10.2026, page {str(num + 1)}', fill='black')
+        for row in range(40):
+            y = 120 + row * 40
+            draw.line((80, y, 1160, y), fill='black')
+            draw.text((100, y + 12), f'GR-{str(row % 7)}{str(num)}   {str(row % 4 + 1)}   Subject {str(row * 7 % 13)}'
+                      f'   Teacher {chr(65 + row % 26)}.{chr(66 + row % 24)}.   {str(100 + row)}', fill='black')
+        pages.append(img)
+    pages[0].save(path, 'PDF', resolution=150, save_all=True, append_images=pages[1:])
+    return path
+
+
+def benchZamena() -> None:
+    '''benchZamena: time and peak RSS of zamena render on 10-page PDF, whole PDF at once vs page at a time.
+    '''
+    import zamena
+    with tempfile.TemporaryDirectory() as tmp:
+        path = makeSamplePdf(os.path.join(tmp, 'zamena.pdf'))
+        for name, func in (('whole PDF', renderWhole), ('page at a time', zamena.renderPdf)):
+            with ProcessPoolExecutor(1) as pool:
+                secs, rss, poppler = pool.submit(runRender, func, path, os.path.join(tmp, name), OLD_PROFILE).result()
+            report(f'render 10 pages, {name}', secs)
+            print(f'{"":<48} {rss:>9.1f} MB worker peak RSS, {poppler:.1f} MB poppler')
+
+
+def benchProfiles() -> None:
+    '''benchProfiles: render time, encode time and bytes per page of zamena encoding profiles,
+    on generated PDF and on cached zamena PDF (if any).
+    '''
+    from pdf2image import convert_from_path, pdfinfo_from_path
+    import zamena
+    conf = Config()
+    profiles = {'old': OLD_PROFILE, **conf.ZAMENA_PROFILES}
+    with tempfile.TemporaryDirectory() as tmp:
+        samples = {'sample': makeSamplePdf(os.path.join(tmp, 'sample.pdf'))}
+        if os.path.exists(os.path.join(conf.ZAMENA_DIR, 'zamena.pdf')):
+            samples['cached'] = os.path.join(conf.ZAMENA_DIR, 'zamena.pdf')
+        for sample, path in samples.items():
+            count = pdfinfo_from_path(path)['Pages']
+            for name, profile in profiles.items():
+                render = encode = size = 0
+                for num in range(1, count + 1):
+                    start = time.perf_counter()
+                    img = convert_from_path(path, profile['dpi'], first_page=num, last_page=num,
+                                            grayscale=profile.get('mode', 'RGB') != 'RGB')[0]
+                    render += time.perf_counter() - start
+                    buf = io.BytesIO()
+                    start = time.perf_counter()
+                    zamena.encodePage(img, buf, profile)
+                    encode += time.perf_counter() - start
+                    size += buf.tell()
+                report(f'{sample}, {name}: render per page', render / count)
+                report(f'{sample}, {name}: encode per page', encode / count)
+                print(f'{"":<48} {size / count / 1024:>9.1f} KB per page')
+
+
+def checkPlans() -> None:
+    '''checkPlans: checks what hot lookups uses index, on new DB with all migrations. Raises QueryPlanError if not.
+    '''
+    from db import Database
+
+    async def check() -> int:
+        conf = Config()
+        with tempfile.TemporaryDirectory() as tmp:
+            conf.db_name = os.path.join(tmp, 'plans.db')
+            db = Database(conf)
+            await db.connect()
+            try:
+                return await db.checkQueryPlans(db.writer_conn)
+            finally:
+                await db.close()
+
+    print(f'{str(asyncio.run(check()))} queries uses index.')
+
+
+BENCHMARKS = {
+    'morph': benchMorph,
+    'zamena': benchZamena,
+    'profiles': benchProfiles,
+    'plans': checkPlans,
+}
+
+
+if __name__ == '__main__':
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        print(f'== {name}')
+        BENCHMARKS[name]()
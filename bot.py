@@ -3,9 +3,11 @@
 #  TeachTime execute script
 #  Created by LulzLoL231 at 2020/09/14
 #
-from aiogram.utils.executor import start_polling
+from aiogram import Dispatcher
+from aiogram.utils.executor import start_polling, set_webhook
 
-from misc import bot
+from misc import bot, db, conf, log, notifier, supervisor, sender, zamena, http
+from webhook import getWebApp
 from cmds_defaults import *
 from cmds_private import *
 from cmds_ench import *
@@ -17,5 +19,46 @@ from cmds_timer import *
 from cmds_info import *
 
 
+async def on_startup(dp: Dispatcher):
+    await db.connect()
+    await notifier.load()
+    supervisor.start('timer')
+    supervisor.start('zamena')
+
+
+async def on_startup_polling(dp: Dispatcher):
+    await dp.bot.delete_webhook()
+    await on_startup(dp)
+
+
+async def on_startup_webhook(dp: Dispatcher):
+    await on_startup(dp)
+    await dp.bot.set_webhook(conf.WEBHOOK_URL + conf.WEBHOOK_PATH, secret_token=conf.WEBHOOK_SECRET)
+    log.info(f'Webhook is set, listening on {conf.WEBAPP_HOST}:{str(conf.WEBAPP_PORT)}{conf.WEBHOOK_PATH}')
+
+
+async def on_shutdown_webhook(dp: Dispatcher):
+    # aiohttp calls on_shutdown before it waits for running handlers, so in-flight updates are awaited here.
+    inflight = web_app['inflight']
+    if not await inflight.wait(conf.WEBHOOK_SHUTDOWN_TIMEOUT):
+        log.warning(f'Shutdown: {str(inflight.count)} updates still in processing after '
+                    f'{str(conf.WEBHOOK_SHUTDOWN_TIMEOUT)} sec.')
+    await on_shutdown(dp)
+
+
+async def on_shutdown(dp: Dispatcher):
+    await supervisor.stopAll()
+    await sender.drain(conf.WEBHOOK_SHUTDOWN_TIMEOUT)
+    await db.close()
+    await http.close()
+    zamena.close()
+
+
 if __name__ == "__main__":
-    start_polling(bot)
+    if conf.WEBHOOK:
+        web_app = getWebApp(conf)
+        executor = set_webhook(bot, conf.WEBHOOK_PATH, on_startup=on_startup_webhook, on_shutdown=on_shutdown_webhook,
+                               web_app=web_app)
+        executor.run_app(host=conf.WEBAPP_HOST, port=conf.WEBAPP_PORT, shutdown_timeout=conf.WEBHOOK_SHUTDOWN_TIMEOUT)
+    else:
+        start_polling(bot, on_startup=on_startup_polling, on_shutdown=on_shutdown)
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+#
+#  TeachTime module "cache".
+#  Created by LulzLoL231 at 2026/10/18
+#
+import time
+import copy
+import logging
+import typing
+from collections import OrderedDict
+
+
+class DateCache:
+    '''DateCache: in-process LRU cache with TTL for DB lookups keyed by date.
+
+    Every date holds values of different kinds (e.g. "day", "times"), so
+    writer can invalidate all lookups of one date at once. Read-through
+    callers takes date generation before read and pass it to set, so
+    value read before invalidation is not cached after it.
+
+    Args:
+        size (int): max dates in cache.
+        ttl (int): seconds before cached date expires.
+    '''
+    MISSING = object()
+
+    def __init__(self, size: int, ttl: int):
+        self.size = size
+        self.ttl = ttl
+        self.dates = OrderedDict()  # date -> (expire time, {kind: value})
+        self.epoch = 0  # whole cache invalidations count
+        self.generations = {}  # date -> date invalidations count
+        self.hits = 0
+        self.misses = 0
+        self.log = logging.getLogger('TeachTime DateCache')
+
+    def get(self, date: str, kind: str) -> typing.Any:
+        '''get: returns copy of cached value or DateCache.MISSING.
+
+        Args:
+            date (str): date in ISO format (YYYY-MM-DD).
+            kind (str): lookup kind.
+
+        Returns:
+            typing.Any: cached value or DateCache.MISSING.
+        '''
+        entry = self.dates.get(date)
+        if entry is None or kind not in entry[1]:
+            self.misses += 1
+            return self.MISSING
+        if entry[0] <= time.monotonic():
+            del self.dates[date]
+            self.misses += 1
+            return self.MISSING
+        self.dates.move_to_end(date)
+        self.hits += 1
+        return copy.deepcopy(entry[1][kind])
+
+    def generation(self, date: str) -> tuple:
+        '''generation: returns date generation, it changes on every date invalidation.
+
+        Args:
+            date (str): date in ISO format (YYYY-MM-DD).
+
+        Returns:
+            tuple: generation.
+        '''
+        return (self.epoch, self.generations.get(date, 0))
+
+    def set(self, date: str, kind: str, value: typing.Any, generation: typing.Optional[tuple] = None) -> None:
+        '''set: puts copy of value into cache, evicts least recently used date if cache is full.
+
+        Args:
+            date (str): date in ISO format (YYYY-MM-DD).
+            kind (str): lookup kind.
+            value (typing.Any): value.
+            generation (typing.Optional[tuple], optional): date generation taken before value was read,
+                value is not cached if date was invalidated since. Defaults to None.
+        '''
+        if generation is not None and generation != self.generation(date):
+            self.log.debug(f'set: {date} {kind} is stale, not cached.')
+            return
+        entry = self.dates.get(date)
+        if entry is None or entry[0] <= time.monotonic():
+            entry = (time.monotonic() + self.ttl, {})
+            self.dates[date] = entry
+        entry[1][kind] = copy.deepcopy(value)
+        self.dates.move_to_end(date)
+        while len(self.dates) > self.size:
+            self.dates.popitem(last=False)
+
+    def invalidate(self, date: typing.Optional[str] = None) -> None:
+        '''invalidate: drops cached values for date, or whole cache if date is None.
+
+        Args:
+            date (typing.Optional[str], optional): date in ISO format (YYYY-MM-DD). Defaults to None.
+        '''
+        self.log.debug(f'invalidate: {str(date)}')
+        if date is None:
+            self.epoch += 1
+            self.dates.clear()
+        else:
+            self.generations[date] = self.generations.get(date, 0) + 1
+            self.dates.pop(date, None)
+
+    def stats(self) -> dict:
+        '''stats: returns cache counters.
+
+        Returns:
+            dict: cache size, hits and misses.
+        '''
+        return {'size': len(self.dates), 'hits': self.hits, 'misses': self.misses}
@@ -45,8 +45,8 @@ async def track_on(msg: types.Message):
     '''
     log.info(f'Command "track_on" from {msg.chat.mention} ({msg.from_user.id})')
     if await check_id(msg, conf):
+        keys.track()
         await msg.answer('Отслеживание расписания: <b>Включено.</b>')
-        await keys.loop()
 
 
 @bot.message_handler(CommandStart())
@@ -3,6 +3,8 @@
 #  TeachTime commands: enhancements.
 #  Created by LulzLoL231 at 2020/09/14
 #
+import asyncio
+
 from aiogram import types
 from aiogram.dispatcher import FSMContext
 
@@ -17,8 +19,9 @@ async def ench_practice(query: types.CallbackQuery):
     log.debug(f'query "ench_practice" from {query.message.chat.mention} ({query.message.chat.id}).')
     await query.answer()
     practice = await db.getPractice(date=getNowDate())
-    await query.message.edit_text(parsePractice(practice))
-    await query.message.edit_reply_markup(getPracticeKey(False))
+    await asyncio.gather(
+        query.message.edit_text(parsePractice(practice)),
+        query.message.edit_reply_markup(getPracticeKey(False)))
 
 
 @bot.callback_query_handler(lambda m: m.data == 'ench:practice:end')
@@ -99,8 +102,9 @@ async def ench_practice_new_setup(msg: types.Message, state: FSMContext):
 @bot.callback_query_handler(lambda m: m.data == 'ench:practice:times:yes')
 async def ench_practice_default_times(query: types.CallbackQuery):
     await query.answer()
-    await query.message.edit_text('А преподователь тот-же?')
-    await query.message.edit_reply_markup(getPracticeDefaultKey('teacher'))
+    await asyncio.gather(
+        query.message.edit_text('А преподователь тот-же?'),
+        query.message.edit_reply_markup(getPracticeDefaultKey('teacher')))
 
 
 @bot.callback_query_handler(lambda m: m.data == 'ench:practice:teacher:yes')
@@ -111,11 +115,13 @@ async def ench_practice_default_teacher(query: types.CallbackQuery):
         last_practice['start_date'] = getNowDate()
         last_practice['end_date'] = None
         last_practice['status'] = 1
-        await query.message.edit_reply_markup(getPracticeDefaultKey('def_verify'))
-        await query.message.edit_text(f'Всё верно?\n{parsePractice(last_practice)}')
+        await asyncio.gather(
+            query.message.edit_reply_markup(getPracticeDefaultKey('def_verify')),
+            query.message.edit_text(f'Всё верно?\n{parsePractice(last_practice)}'))
     else:
-        await query.message.edit_reply_markup(types.InlineKeyboardMarkup())
-        await query.message.edit_text('<b>Ошибка</b>. Прошлая практика не найдена в БД.')
+        await asyncio.gather(
+            query.message.edit_reply_markup(types.InlineKeyboardMarkup()),
+            query.message.edit_text('<b>Ошибка</b>. Прошлая практика не найдена в БД.'))
 
 
 @bot.callback_query_handler(lambda m: m.data == 'ench:practice:def_verify:yes')
@@ -129,5 +135,6 @@ async def ench_practice_default_setup(query: types.CallbackQuery):
     last_practice['start_date'] = getNowDate()
     last_practice['status'] = 1
     last_practice['end_date'] = None
-    await query.message.edit_reply_markup(types.InlineKeyboardMarkup())
-    await query.message.edit_text(parsePractice(last_practice))
+    await asyncio.gather(
+        query.message.edit_reply_markup(types.InlineKeyboardMarkup()),
+        query.message.edit_text(parsePractice(last_practice)))
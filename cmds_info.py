@@ -35,21 +35,10 @@ async def search_final(msg: types.Message, state: FSMContext):
     await state.finish()
     data = msg.text
     ev = await msg.answer('<code>Идёт поиск...</code>')
-    cnt = '\n\n'
-    students = await db.searchStudent(data)
-    if students:
-        if type(students) is list:
-            cnt = cnt.join([parseStudent(i) for i in students])
-        else:
-            cnt = parseStudent(students)
+    people = await db.searchPeople(data)
+    if people:
+        cnt = '\n\n'.join([parseStudent(i) if i['kind'] == 'student' else parseTeacher(i) for i in people])
     else:
-        teachers = await db.searchTeacher(data)
-        if teachers:
-            if type(teachers) is list:
-                cnt = cnt.join([parseTeacher(i) for i in teachers])
-            else:
-                cnt = parseTeacher(teachers)
-        else:
-            cnt = 'Поиск <b>не дал результатов.</b>'
+        cnt = 'Поиск <b>не дал результатов.</b>'
     await ev.delete()
     await msg.answer(cnt, reply_markup=getStartKey())
@@ -6,9 +6,10 @@
 from datetime import datetime
 
 from aiogram import types
+from aiogram.utils.markdown import quote_html
 
 from utils import check_id
-from misc import bot, log, conf
+from misc import bot, log, conf, db, sender, supervisor, http
 from cmds_set_lessons import sendZamenaImages
 
 
@@ -70,9 +71,79 @@ Admin ID: {}</code>'''
                                      conf.db_name, str(conf.ADMIN_ID)))
 
 
+@bot.message_handler(lambda m: m.text == '.cache')
+async def get_cache_stats(msg: types.Message):
+    '''get_cache_stats: Bot private cmd. Returns DB cache counters.
+
+    Args:
+        msg (types.Message): Telegram message.
+    '''
+    log.info(
+        f'Private command "get_cache_stats" from {msg.chat.mention} ({msg.from_user.id})')
+    if await check_id(msg, conf):
+        stats = db.cache.stats()
+        await msg.answer(f'<code>Dates: {str(stats["size"])}\n'
+                         f'Hits: {str(stats["hits"])}\n'
+                         f'Misses: {str(stats["misses"])}</code>')
+
+
+@bot.message_handler(lambda m: m.text == '.sender')
+async def get_sender_stats(msg: types.Message):
+    '''get_sender_stats: Bot private cmd. Returns send queue metrics.
+
+    Args:
+        msg (types.Message): Telegram message.
+    '''
+    log.info(
+        f'Private command "get_sender_stats" from {msg.chat.mention} ({msg.from_user.id})')
+    if await check_id(msg, conf):
+        stats = sender.stats()
+        await msg.answer(f'<code>Queue depth: {str(stats["depth"])} ({str(stats["chats"])} chats)\n'
+                         f'Sent: {str(stats["sent"])}, merged: {str(stats["merged"])}, '
+                         f'retried: {str(stats["retried"])}, failed: {str(stats["failed"])}\n'
+                         f'Latency: avg {str(stats["latency_avg"])} ms, p95 {str(stats["latency_p95"])} ms, '
+                         f'max {str(stats["latency_max"])} ms</code>')
+
+
+@bot.message_handler(lambda m: m.text == '.http')
+async def get_http_stats(msg: types.Message):
+    '''get_http_stats: Bot private cmd. Returns outbound HTTP client metrics.
+
+    Args:
+        msg (types.Message): Telegram message.
+    '''
+    log.info(
+        f'Private command "get_http_stats" from {msg.chat.mention} ({msg.from_user.id})')
+    if await check_id(msg, conf):
+        stats = http.stats()
+        await msg.answer(f'<code>Requests: {str(stats["requests"])}, failed: {str(stats["failed"])}\n'
+                         f'Connections: new {str(stats["connected"])}, reused {str(stats["reused"])}, '
+                         f'DNS lookups {str(stats["dns"])}\n'
+                         f'Latency: avg {str(stats["latency_avg"])} ms, p95 {str(stats["latency_p95"])} ms, '
+                         f'max {str(stats["latency_max"])} ms</code>')
+
+
+@bot.message_handler(lambda m: m.text == '.tasks')
+async def get_tasks(msg: types.Message):
+    '''get_tasks: Bot private cmd. Returns background tasks states.
+
+    Args:
+        msg (types.Message): Telegram message.
+    '''
+    log.info(
+        f'Private command "get_tasks" from {msg.chat.mention} ({msg.from_user.id})')
+    if await check_id(msg, conf):
+        cnt = ''
+        for name, state in supervisor.stats().items():
+            started = datetime.fromtimestamp(state['started']).strftime('%Y-%m-%d %H:%M:%S') if state['started'] else '-'
+            cnt += (f'{name}: {state["state"]}, started: {started}, restarts: {str(state["restarts"])}\n'
+                    f'  last error: {state["error"] or "-"}\n')
+        await msg.answer(f'<code>{quote_html(cnt) or "No tasks."}</code>')
+
+
 @bot.message_handler(lambda m: m.text == '.send_zamena')
 async def send_zamena(msg: types.Message):
-    '''send_zamena: Bot private cmd. Sends zamena images.
+    '''send_zamena: Bot private cmd. Sends all zamena images.
 
     Args:
         msg (types.Message): Telegram message.
@@ -81,6 +152,6 @@ async def send_zamena(msg: types.Message):
     if await check_id(msg, conf):
         zam = await msg.answer('<code>Получение замены...</code>')
         dt_start = datetime.now()
-        await sendZamenaImages(zam)
+        await sendZamenaImages(zam, force=True)
         dt_end = datetime.now()
         await msg.answer(f'<code>Time passed: {str((dt_end - dt_start).total_seconds())}</code>')
@@ -3,22 +3,17 @@
 #  TeachTime commands group: set lessons
 #  Created by LulzLoL231 at 2020/09/14
 #
-import os
-import io
-import tempfile
-
-import aiohttp
-import aiofiles
-from pdf2image import convert_from_bytes as pdf
 from aiogram import types
 from aiogram.dispatcher import FSMContext
+from aiogram.utils.exceptions import BadRequest
 
-from misc import bot, log, db, conf
+from misc import bot, log, db, conf, zamena
 from utils import (
     check_id, check_cmd, parseLessons, getNowDate, getNextDate,
     getLessonsDaysKey, getNotPassedLessons, getLessonsTypesKey, getLessonsLength,
     getLessonsFromStateDict, isWeekend, getLessonsLengthKey, getStartKey,
-    getVerifyKey, getDefaultTimeKey, getDefaultLessonsKey, getSendZamenaImagesKey
+    getVerifyKey, getDefaultTimeKey, getDefaultLessonsKey, getSendZamenaImagesKey,
+    parseZamenaRecords, getZamenaLessons, getZamenaApplyKey
 )
 from states import SetTypesTimes, SetLessons
 
@@ -27,8 +22,40 @@ from states import SetTypesTimes, SetLessons
 async def szi_query(query: types.CallbackQuery):
     log.debug('szi_query Called!')
     await query.answer('Отправляю...')
-    await sendZamenaImages(query.message.chat.id)
-    await query.message.delete()
+    await sendZamenaImages(query.message, force=True)
+
+
+@bot.callback_query_handler(lambda m: m.data.startswith('zamenaApply:'))
+async def zamenaApply_query(query: types.CallbackQuery):
+    log.debug('zamenaApply_query Called!')
+    if query.from_user.id != conf.ADMIN_ID:
+        await query.answer('Доступ запрещён.')
+        return
+    date = query.data.split(':')[1]
+    records = [i for i in (zamena.ready or {}).get('records') or [] if i['date'] == date]
+    timetable = await db.getTypesTimesByDate(date)
+    if not records:
+        await query.answer('Замена на эту дату устарела.')
+        return
+    if not timetable:
+        await query.answer('Сначала установи время пар на эту дату.')
+        return
+    lessons = getZamenaLessons(await db.getDefaultLessonsByDate(date), records, timetable, date)
+    # all pairs of date can be cancelled, so date is passed to replace its lessons anyway.
+    if await db.addLessons(lessons, replace=True, dates=[date]) is not True:
+        await query.answer('Непредвиденная ошибка!')
+        return
+    await query.answer('Пары установлены.')
+    # buttons of other dates, not applied yet, stays.
+    markup = query.message.reply_markup.inline_keyboard if query.message.reply_markup else []
+    await query.message.edit_reply_markup(getZamenaApplyKey(
+        i.callback_data.split(':')[1] for row in markup for i in row
+        if i.callback_data and i.callback_data.startswith('zamenaApply:') and i.callback_data != query.data))
+    state = bot.current_state(chat=query.message.chat.id, user=query.from_user.id)
+    if await state.get_state() == SetLessons.wait_default.state:
+        await state.finish()
+    await query.message.answer('Пары <b>успешно установлены!</b>\n' + parseLessons(await db.getDay(date), date),
+                               reply_markup=getStartKey())
 
 
 @bot.callback_query_handler(lambda m: m.data == 'sziFalse')
@@ -51,7 +78,7 @@ async def setLessons_date(msg: types.Message, state: FSMContext):
     log.info(f'Command "setLessons" from {msg.chat.mention} ({msg.from_user.id})')
     if await check_id(msg, conf):
         if isWeekend(getNowDate()):
-            lessons = await db.getLessonsByDate(getNextDate())
+            lessons = await db.getDay(getNextDate())
             if lessons:
                 await msg.answer('Сегодня выходной, и пары на завтра <b>установлены.</b>\n'
                                  f'Вот {parseLessons(lessons, getNextDate())}')
@@ -68,10 +95,10 @@ async def setLessons_date(msg: types.Message, state: FSMContext):
                     await msg.answer('Время стандартное?', reply_markup=getDefaultTimeKey())
                     await SetLessons.wait_tt.set()
         else:
-            lessons = await db.getLessonsByDate(getNowDate())
+            lessons = await db.getDay(getNowDate())
             if lessons:
                 if isWeekend(getNextDate()):
-                    monday_lessons = await db.getLessonsByDate(getNextDate(2))
+                    monday_lessons = await db.getDay(getNextDate(2))
                     if monday_lessons:
                         await msg.answer('Завтра <b>выходной</b>, а пары на <b>понедельник</b> уже установлены.')
                         await msg.answer(parseLessons(monday_lessons, getNextDate(2)))
@@ -133,7 +160,7 @@ async def setLessons_length(msg: types.Message, state: FSMContext):
         await msg.reply('<b>Выбери дату нормально, сука!</b>')
         return
     if msg.text == 'На сегодня':
-        lessons = await db.getLessonsByDate(getNowDate())
+        lessons = await db.getDay(getNowDate())
         if lessons:
             await state.finish()
             if getNotPassedLessons(lessons):
@@ -153,7 +180,7 @@ async def setLessons_length(msg: types.Message, state: FSMContext):
                 await msg.answer('Время стандартное?', reply_markup=getDefaultTimeKey())
                 await SetLessons.wait_tt.set()
     else:
-        lessons = await db.getLessonsByDate(getNextDate())
+        lessons = await db.getDay(getNextDate())
         if lessons:
             await state.finish()
             if getNotPassedLessons(lessons):
@@ -186,7 +213,8 @@ async def setLessons_tt(msg: types.Message, state: FSMContext):
             await state.finish()
         else:
             await msg.answer('Пары стандартные?', reply_markup=getDefaultLessonsKey())
-            await sendZamenaImages(msg.chat.id)
+            zam_msg = await msg.answer('<code>Получение замены...</code>')
+            await sendZamenaImages(zam_msg)
             await SetLessons.wait_default.set()
     else:
         await state.update_data(custom_tt=True)
@@ -335,8 +363,7 @@ async def setLessons_end(msg: types.Message, state: FSMContext):
         else:
             lessons = data['lessons']
         if lessons:
-            for lesson in lessons:
-                await db.addLesson(lesson['name'], lesson['type'], lesson['date'])
+            await db.addLessons(lessons, replace=True, dates=[data['date']])
             await msg.answer('Пары <b>успешно установлены!</b>', reply_markup=getStartKey())
         else:
             await msg.answer('Возникла непредвидинная ошибка, иди в логи сука!', reply_markup=getStartKey())
@@ -356,51 +383,75 @@ async def sendZamenaQuery(chat_id: int) -> None:
                                reply_markup=getSendZamenaImagesKey())
 
 
-async def sendZamenaImages(msg: types.Message) -> None:
-    '''Sends zamena images.
+async def answerZamenaPages(msg: types.Message, nums: list, photos: list, total: int) -> list:
+    '''Sends zamena pages photos to chat, as one photo or as album.
+
+    Args:
+        msg (types.Message): Telegram message.
+        nums (list): pages numbers, from 0.
+        photos (list): pages photos, telegram file ids or types.InputFile.
+        total (int): count of pages in zamena.
+
+    Returns:
+        list: sent messages.
+    '''
+    if total == 1:
+        return [await msg.answer_photo(photos[0], caption='Замена')]
+    elif len(photos) == 1:
+        return [await msg.answer_photo(photos[0], caption=f'Замена {str(nums[0] + 1)} страница.')]
+    media = types.MediaGroup()
+    for num, photo in zip(nums, photos):
+        media.attach_photo(photo, caption=f'Замена {str(num + 1)} страница.')
+    return await msg.answer_media_group(media)
+
+
+async def sendZamenaImages(msg: types.Message, force: bool = False) -> None:
+    '''Sends zamena images prepared by zamena prefetcher, only pages changed since zamena sent to chat last time.
+    Pages already uploaded are sent by telegram file id. Zamena what was parsed from PDF text is sent
+    as replacements list, with buttons what sets lessons.
 
     Args:
         msg (types.Message): Telegram message.
+        force (bool, optional): send all pages. Defaults to False.
     '''
     log.info(
         f'sendZamenaImages called with args: ({str(msg)})')
-    await bot.bot.send_chat_action(msg.chat.id, types.ChatActions.UPLOAD_PHOTO)
-    try:
-        # TODO: Check ETag.
-        async with aiohttp.ClientSession() as ses:
-            async with ses.get('[REMOVED]') as resp:
-                if resp.status == 200:
-                    file = await resp.read()
-    except Exception as e:
-        log.error(
-            f'sendZamenaImages Download Error: {str(e)}.')
-        await msg.edit_text('<code>Ошибка при получении замены.</code>')
+    if zamena.ready is None:
+        log.warning('sendZamenaImages: zamena is not prepared yet.')
+        await msg.edit_text('<code>Замена ещё не получена, попробуй позже.</code>')
+    elif zamena.ready['records']:
+        ready = zamena.ready
+        if not force and await db.getZamenaSent(msg.chat.id) == ready['sha256']:
+            await msg.edit_text('<code>Замена не изменилась.</code>')
+            return
+        await msg.edit_text(parseZamenaRecords(ready['records']),
+                            reply_markup=getZamenaApplyKey(i['date'] for i in ready['records']))
+        await db.setZamenaSent(msg.chat.id, ready['sha256'])
     else:
-        await ses.close()
+        ready = zamena.ready
+        hashes, pages = ready['hashes'], ready['paths']
+        nums = list(range(len(hashes))) if force else await zamena.getChangedPages(msg.chat.id)
+        if not nums:
+            await msg.edit_text('<code>Замена не изменилась.</code>')
+            return
+        await bot.bot.send_chat_action(msg.chat.id, types.ChatActions.UPLOAD_PHOTO)
+        file_ids = await db.getZamenaFileIds(hashes[i] for i in nums)
+        log.info(
+            f'sendZamenaImage Sending {str(len(nums))} of {str(len(hashes))} images in zamena, '
+            f'{str(len(file_ids))} already uploaded.')
+        await msg.delete()
         try:
-            images = pdf(file, 100)
-        except Exception as e:
-            log.error(
-                f'sendZamenaImage Parse PDF Error: {str(e)}.')
-            await msg.edit_text('<code>Ошибка при получении замены.</code>')
-        else:
-            log.info(
-                f'sendZamenaImage Found {str(len(images))} images in zamena.')
-            log.info(f'images: {str(images)}')
-            saved = []
-            for num, img in enumerate(images):
-                buf = io.BytesIO()
-                img.save(buf, 'JPEG')
-                saved.append(io.BytesIO(buf.getvalue()))
-            log.info(f'saved length: {str(len(saved))}')
-            if len(saved) == 1:
-                await msg.delete()
-                await msg.answer_photo(types.InputFile(saved[0]), caption='Замена')
-            else:
-                media = types.MediaGroup()
-                for num, img in enumerate(saved):
-                    media.attach_photo(types.InputFile(img), caption=f'Замена {str(num + 1)} страница.')
-                await msg.delete()
-                await msg.answer_media_group(media)
-            for buf in saved:
-                buf.close()
+            sent = await answerZamenaPages(msg, nums, [file_ids.get(hashes[i]) or types.InputFile(pages[i]) for i in nums],
+                                           len(hashes))
+        except BadRequest as e:
+            if not file_ids:
+                raise
+            # file ids are valid only for bot what uploaded it (beta bot shares DB), so upload these pages again.
+            log.warning(f'sendZamenaImages: stored file ids rejected, uploading pages again: {str(e)}')
+            await db.removeZamenaFileIds(file_ids.keys())
+            file_ids = {}
+            sent = await answerZamenaPages(msg, nums, [types.InputFile(pages[i]) for i in nums], len(hashes))
+        await db.setZamenaSent(msg.chat.id, ready['sha256'])
+        uploaded = {hashes[i]: m.photo[-1].file_id for i, m in zip(nums, sent) if hashes[i] not in file_ids and m.photo}
+        if uploaded:
+            await db.addZamenaFileIds(uploaded)
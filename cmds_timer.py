@@ -8,7 +8,7 @@ from random import choice
 
 from aiogram import types
 
-from misc import bot, conf, timer
+from misc import bot, conf, timer, notifier, supervisor
 from utils import (
     check_id, check_cmd, getLessonEt
 )
@@ -42,7 +42,7 @@ async def visit_lesson(query: types.CallbackQuery):
     await bot.bot.answer_callback_query(query.id, getRandomGood())
     lessonid = await timer.getLessonIDFromLessonInfo(query.data)
     if lessonid:
-        await timer.db.visitLesson(lessonid)
+        await timer.db.visitLesson(lessonid, wait=False)
         await bot.bot.edit_message_reply_markup(query.message.chat.id, query.message.message_id, types.InlineKeyboardMarkup())
     else:
         log.debug(f'visitLesson error - lessonid: {str(lessonid)}')
@@ -78,7 +78,7 @@ async def timerstatus(msg: types.Message):
     if await check_id(msg, conf):
         log.info(
             f'Command "timerstatus" from {msg.chat.mention} ({msg.from_user.id})')
-        if timer.work:
+        if supervisor.isRunning('timer'):
             if timer.lesson:
                 lesson = await timer.getCurrentLesson()
                 start_time = await timer.getLessonStartEt()
@@ -94,8 +94,8 @@ async def timerstatus(msg: types.Message):
                 await msg.answer('На <b>сегодня</b> уроков <b>нету/кончились</b>.')
         else:
             ev = await msg.answer('Уведомления <b>выключены.</b> Идёт включение...')
+            supervisor.start('timer')
             await ev.edit_text('Уведомления <b>включены!</b>')
-            await timer.main()
 
 
 @bot.message_handler(lambda m: check_cmd(m, 'timeroff'))
@@ -103,8 +103,35 @@ async def timerstatus(msg: types.Message):
 async def timeroff(msg: types.Message):
     if await check_id(msg, conf):
         log.info(f'Command "timeroff" from {msg.chat.mention} ({msg.from_user.id})')
-        if timer.work:
-            timer.work = False
+        if await supervisor.stop('timer'):
             await msg.answer('Уведомления <b>выключены.</b>')
         else:
             await msg.answer('Уведомления <b>уже выключены!</b>')
+
+
+@bot.message_handler(commands=('subscribe', 'sub'))
+async def subscribe(msg: types.Message):
+    '''subscribe: Bot cmd. Subscribes chat to lessons notifications, available for everyone.
+
+    Args:
+        msg (types.Message): telegram message.
+    '''
+    log.info(f'Command "subscribe" from {msg.chat.mention} ({msg.from_user.id})')
+    if await notifier.subscribe(msg.chat.id, msg.chat.mention):
+        await msg.answer('Уведомления о парах <b>включены.</b> Отписаться: /unsubscribe')
+    else:
+        await msg.answer('Уведомления о парах <b>уже включены!</b>')
+
+
+@bot.message_handler(commands=('unsubscribe', 'unsub'))
+async def unsubscribe(msg: types.Message):
+    '''unsubscribe: Bot cmd. Unsubscribes chat from lessons notifications, available for everyone.
+
+    Args:
+        msg (types.Message): telegram message.
+    '''
+    log.info(f'Command "unsubscribe" from {msg.chat.mention} ({msg.from_user.id})')
+    if await notifier.unsubscribe(msg.chat.id):
+        await msg.answer('Уведомления о парах <b>выключены.</b>')
+    else:
+        await msg.answer('Уведомления о парах <b>не были включены.</b>')
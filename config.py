@@ -3,6 +3,7 @@
 #  TeachTime module "Config"
 #  Created by LulzLoL231 at 09/09/20
 #
+import os
 import logging
 from sys import platform
 
@@ -26,6 +27,46 @@ class Config(object):
         self.KEY = b'[REMOVED]'
         self.BASE_DIR = '/home/lulz/TeachTime' if platform == 'linux' else 'C:\\Users\\lulz\\Documents\\python\\TeachTime'
         self.db_name = '/home/lulz/TeachTime/' + db_name if platform == 'linux' else db_name
+        self.DB_POOL_SIZE = 4  # max opened DB connections
+        self.DB_POOL_PING = 60  # health check idle connections after 60 sec.
+        self.CACHE_SIZE = 32  # dates in DB lookups cache
+        self.CACHE_TTL = 600  # cached date expires after 10 minutes
+        self.NOTIFY_CONCURRENCY = 20  # max alerts sending at once
+        self.SEND_GLOBAL_RATE = 30  # max Bot API sends per second, for all chats
+        self.SEND_CHAT_RATE = 1  # max sends per second to one chat
+        self.SEND_CHAT_BURST = 3  # sends to one chat allowed at once, before rate limit
+        self.SEND_RETRIES = 3  # retries on flood control (429)
+        self.TASK_BACKOFF = 1  # first restart of crashed background task after 1 sec.
+        self.TASK_BACKOFF_MAX = 300  # max restart delay, doubles on every crash
+        self.TASK_STOP_TIMEOUT = 10  # seconds for background task to stop, before cancel
+        self.WEBHOOK = False  # receive updates by webhook, instead of long polling
+        self.WEBHOOK_URL = 'https://[REMOVED]'  # public base URL of webhook server
+        self.WEBHOOK_PATH = '/teachtime/webhook'
+        self.WEBHOOK_SECRET = '[REMOVED]'  # Telegram sends it in X-Telegram-Bot-Api-Secret-Token header
+        self.WEBAPP_HOST = '127.0.0.1'  # webhook server listens here, behind reverse proxy
+        self.WEBAPP_PORT = 8080
+        self.WEBHOOK_SHUTDOWN_TIMEOUT = 30  # seconds for in-flight updates to finish on shutdown
+        self.HTTP_POOL_SIZE = 10  # max outbound HTTP connections
+        self.HTTP_KEEPALIVE = 60  # seconds idle HTTP connection is kept open
+        self.HTTP_DNS_TTL = 300  # seconds resolved hosts are cached
+        self.HTTP_TIMEOUT = 60  # seconds for whole HTTP request
+        self.HTTP_CONNECT_TIMEOUT = 10  # seconds for HTTP connect
+        self.ZAMENA_URL = '[REMOVED]'
+        self.ZAMENA_DIR = os.path.join(self.BASE_DIR, 'zamena')  # last zamena PDF and rendered pages cache
+        self.ZAMENA_PROFILES = {  # zamena pages encoding profiles, "python bench.py profiles" compares them
+            # dpi, mode (RGB, L - grayscale, 1 - black and white, P - palette), format (JPEG, PNG),
+            # quality and progressive for JPEG, colors for P mode, max_size - longest side in pixels.
+            'color': {'dpi': 100, 'mode': 'RGB', 'format': 'JPEG', 'quality': 75},
+            'gray': {'dpi': 150, 'mode': 'L', 'format': 'JPEG', 'quality': 70, 'progressive': True, 'max_size': 2560},
+            'bw': {'dpi': 200, 'mode': '1', 'format': 'PNG', 'max_size': 2560},
+            'palette': {'dpi': 150, 'mode': 'P', 'format': 'PNG', 'colors': 8, 'max_size': 2560},
+        }
+        self.ZAMENA_PROFILE = 'gray'  # zamena pages encoding profile, key of ZAMENA_PROFILES
+        self.ZAMENA_INTERVAL = 600  # seconds between zamena source polls
+        self.ZAMENA_GROUP = '[REMOVED]'  # group name in zamena table
+        self.ZAMENA_WORKERS = 1  # zamena render processes
+        self.ZAMENA_RENDER_TIMEOUT = 60  # seconds for zamena render, worker is killed after
+        self.ZAMENA_MEMORY_LIMIT = 1024  # MB of address space for zamena render worker, 0 is no limit
         self.debug = debug
         self.log_debug = log_debug
         if log_debug or debug:
@@ -3,13 +3,30 @@
 #  TeachTime module "database".
 #  Created by LulzLoL231 at 09/09/20
 #
+import json
+import time
+import asyncio
 import logging
 import typing
+from contextlib import asynccontextmanager
 
 import aiosqlite
 
 import config
 import utils
+import migrations
+from cache import DateCache
+from events import (EventBus, LessonsChanged, TimetableChanged, VisitRecorded,
+                    PracticeStarted, PracticeEnded)
+
+
+# pool queue markers, next to idle connections.
+SLOT_FREED = object()  # pooled connection was closed, waiter can open new one
+POOL_CLOSED = object()  # pool was closed, waiters fails
+
+
+class QueryPlanError(Exception):
+    '''QueryPlanError: hot lookups scans tables instead of index.'''
 
 
 class Database:
@@ -17,10 +34,382 @@ class Database:
 
     Args:
         conf (config.Config): TeachTime config instance.
+        events (EventBus, optional): bus for change events, published after commit. Defaults to new bus.
     '''
-    def __init__(self, conf: config.Config):
+    # lessons with their times, "types_times" row limited for case of duplicated date.
+    DAY_QUERY = (
+        'SELECT l._rowid_ AS id, l.name, l.type, l.date, l.visit, l.info, '
+        'CASE l.type WHEN 1 THEN t.start1 WHEN 2 THEN t.start2 WHEN 3 THEN t.start3 WHEN 4 THEN t.start4 END AS "from", '
+        'CASE l.type WHEN 1 THEN t.end1 WHEN 2 THEN t.end2 WHEN 3 THEN t.end3 WHEN 4 THEN t.end4 END AS "to" '
+        'FROM lessons AS l JOIN (SELECT * FROM types_times WHERE date=? LIMIT 1) AS t ON t.date = l.date '
+        'WHERE l.date=?'
+    )
+    # DAY_QUERY filter of not passed lessons.
+    DAY_PARSE_FILTER = ' AND NOT ifnull(l.visit, 0) AND (l.date || \' \' || "to") > ?'
+    PEOPLE_QUERY = 'SELECT kind, ref FROM people WHERE people MATCH ? ORDER BY rank LIMIT ?'
+
+    # lookups what must be served by index, checked by checkQueryPlans. Keep in step with queries below.
+    INDEXED_QUERIES = (
+        ('SELECT name, type FROM default_lessons WHERE weekday=? AND week=?', (1, 0)),
+        (DAY_QUERY + ' ORDER BY l.type', ('', '')),
+        (DAY_QUERY + DAY_PARSE_FILTER + ' ORDER BY l.type', ('', '', '')),
+        ('SELECT date FROM lessons WHERE _rowid_=?', (0,)),
+        ('UPDATE lessons SET visit=? WHERE _rowid_=?', (0, 0)),
+        ('SELECT * FROM lessons WHERE _rowid_=?', (0,)),
+        ('SELECT _rowid_ FROM lessons WHERE name=? AND date=?', ('', '')),
+        ('DELETE FROM lessons WHERE date=?', ('',)),
+        ('SELECT * FROM types_times WHERE date=?', ('',)),
+        ('SELECT lesson_name FROM aliases WHERE alias=?', ('',)),
+        ('SELECT * FROM teachers WHERE lesson_name=?', ('',)),
+        (PEOPLE_QUERY, ('a*', 10)),
+        ('SELECT _rowid_ AS ref, * FROM students WHERE _rowid_ IN (?,?)', (0, 0)),
+        ('SELECT _rowid_ AS ref, * FROM teachers WHERE _rowid_ IN (?,?)', (0, 0)),
+        ('SELECT a._rowid_ AS alias_ref, t._rowid_ AS ref, t.* FROM aliases AS a '
+         'JOIN teachers AS t ON t.lesson_name = a.lesson_name WHERE a._rowid_ IN (?,?)', (0, 0)),
+        ('SELECT * FROM practices WHERE start_date=?', ('',)),
+        ('SELECT _rowid_ FROM practices WHERE start_date=?', ('',)),
+        ('UPDATE practices SET status=? AND end_date=? WHERE start_date=?', (0, '', '')),
+        ('SELECT lesson_id, kind FROM sent_alerts WHERE lesson_id IN (?,?)', (0, 0)),
+        ('DELETE FROM sent_alerts WHERE lesson_id=?', (0,)),  # lessons delete trigger
+        ('SELECT alive_at FROM timer_alive WHERE id=?', (0,)),
+        ('DELETE FROM subscribers WHERE chat_id=?', (0,)),
+        ('SELECT hash FROM zamena_pages WHERE pdf=? ORDER BY page', ('',)),
+        ('DELETE FROM zamena_pages WHERE pdf=?', ('',)),
+        ('SELECT hash, file_id FROM zamena_files WHERE hash IN (?,?)', ('', '')),
+        ('DELETE FROM zamena_files WHERE hash=?', ('',)),
+        ('SELECT pdf FROM zamena_sent WHERE chat_id=?', (0,)),
+        ('SELECT records FROM zamena_records WHERE pdf=?', ('',)),
+    )
+
+    def __init__(self, conf: config.Config, events: typing.Optional[EventBus] = None):
         self.db_name = conf.db_name
+        self.debug = conf.debug
+        self.pool_size = conf.DB_POOL_SIZE
+        self.ping_interval = conf.DB_POOL_PING
         self.log = logging.getLogger('TeachTime Database')
+        self.pool = None  # idle connections queue, None if pool is not opened
+        self.pool_lock = asyncio.Lock()
+        self.opened = 0  # connections opened by pool
+        self.last_used = {}  # connection -> monotonic time of last release
+        self.cache = DateCache(conf.CACHE_SIZE, conf.CACHE_TTL)
+        self.events = events or EventBus()
+        for event in (LessonsChanged, TimetableChanged, VisitRecorded):
+            self.events.subscribe(event, lambda e: e.date and self.cache.invalidate(e.date))
+        self.writer = None  # writer task
+        self.writer_conn = None  # the only connection what writes to DB
+        self.writes = None  # write jobs queue
+        self.closed = False  # closed DB is never opened again, late callers gets ConnectionError
+
+    async def connect(self) -> bool:
+        '''connect: opens writer connection, applies migrations, and opens connections pool.
+        Pool connections itself opens lazily, on demand.
+
+        Raises:
+            ConnectionError: DB was closed.
+
+        Returns:
+            bool: True if pool was opened, False if it already opened.
+        '''
+        async with self.pool_lock:
+            if self.closed:
+                raise ConnectionError('DB is closed.')
+            if self.pool is not None:
+                return False
+            self.log.debug(f'connect: opening pool with size: {str(self.pool_size)}')
+            self.writer_conn = await aiosqlite.connect(self.db_name, isolation_level=None)
+            self.writer_conn.row_factory = aiosqlite.Row
+            # only people index rebuild of migration 4 calls "lemmas", triggers leaves it to fillPeopleLemmas.
+            await self.writer_conn.create_function('lemmas', 1, utils.getLemmas, deterministic=True)
+            await self.writer_conn.execute('PRAGMA journal_mode=WAL')
+            await self.writer_conn.execute('PRAGMA synchronous=NORMAL')
+            await migrations.migrate(self.writer_conn)
+            if self.debug:
+                await self.checkQueryPlans(self.writer_conn)
+            self.writes = asyncio.Queue()
+            self.writer = asyncio.ensure_future(self.writerLoop())
+            self.pool = asyncio.Queue()
+            self.opened = 0
+        # people rows written outside of bot (or before migration 10) may have no lemmas yet.
+        await self.write(self.fillPeopleLemmas)
+        return True
+
+    async def close(self) -> None:
+        '''close: drains write jobs queue, closes writer and all idle pool connections.
+        Borrowed connections closes on release.
+        '''
+        async with self.pool_lock:
+            self.closed = True
+            if self.pool is None:
+                return
+            pool, self.pool = self.pool, None
+            self.writes.put_nowait(None)
+            # crashed writer must not stop pool closing.
+            if self.writer.done():
+                error = None if self.writer.cancelled() else self.writer.exception()
+                if error:
+                    self.log.error(f'close: writer was crashed: {str(error)}')
+            else:
+                try:
+                    await self.writer
+                except Exception as e:
+                    self.log.error(f'close: writer failed: {str(e)}')
+            self.writer = None
+            await self.writer_conn.close()
+            while not pool.empty():
+                conn = pool.get_nowait()
+                if conn is not SLOT_FREED:
+                    await self.closeConnection(conn)
+            # tasks what waits for connection are woken one by one.
+            pool.put_nowait(POOL_CLOSED)
+            self.log.debug('close: pool is closed.')
+
+    async def submit(self,
+                     job: typing.Callable[[aiosqlite.Connection], typing.Awaitable],
+                     after: typing.Optional[typing.Callable[[typing.Any], None]] = None) -> asyncio.Future:
+        '''submit: puts write job into writer queue.
+
+        Args:
+            job (typing.Callable[[aiosqlite.Connection], typing.Awaitable]): coroutine function, called with writer connection inside transaction.
+            after (typing.Optional[typing.Callable[[typing.Any], None]], optional): called with job result after commit. Defaults to None.
+
+        Returns:
+            asyncio.Future: job result, set after commit.
+        '''
+        if self.pool is None:
+            await self.connect()
+        if self.writer.done():
+            # writer crashed, queued jobs are failed and writer is restarted.
+            error = None if self.writer.cancelled() else self.writer.exception()
+            self.log.error(f'submit: writer is dead ({str(error)}), restarting.')
+            while not self.writes.empty():
+                item = self.writes.get_nowait()
+                if item is not None and not item[2].done():
+                    item[2].set_exception(ConnectionError('DB writer crashed.'))
+            self.writer = asyncio.ensure_future(self.writerLoop())
+        fut = asyncio.get_event_loop().create_future()
+        fut.add_done_callback(self.writeDone)
+        self.writes.put_nowait((job, after, fut))
+        return fut
+
+    async def write(self,
+                    job: typing.Callable[[aiosqlite.Connection], typing.Awaitable],
+                    after: typing.Optional[typing.Callable[[typing.Any], None]] = None) -> typing.Any:
+        '''write: submits write job and waits for its commit.
+
+        Args:
+            job (typing.Callable[[aiosqlite.Connection], typing.Awaitable]): coroutine function, called with writer connection inside transaction.
+            after (typing.Optional[typing.Callable[[typing.Any], None]], optional): called with job result after commit. Defaults to None.
+
+        Returns:
+            typing.Any: job result.
+        '''
+        return await (await self.submit(job, after))
+
+    def writeDone(self, fut: asyncio.Future) -> None:
+        '''writeDone: logs failed write job, so not awaited futures never loses errors.
+
+        Args:
+            fut (asyncio.Future): write job future.
+        '''
+        if not fut.cancelled() and fut.exception():
+            self.log.error(f'writeDone: write job failed: {str(fut.exception())}')
+
+    async def writerLoop(self) -> None:
+        '''writerLoop: writer task. Commits all queued write jobs in one transaction (group commit).
+        '''
+        self.log.debug('writerLoop: started.')
+        stop = False
+        while not stop:
+            batch = [await self.writes.get()]
+            while not self.writes.empty():
+                batch.append(self.writes.get_nowait())
+            if None in batch:
+                stop = True
+                batch = [i for i in batch if i is not None]
+            if not batch:
+                continue
+            results = []
+            try:
+                if self.writer_conn.in_transaction:  # rollback of previous batch failed.
+                    await self.writer_conn.execute('ROLLBACK')
+                await self.writer_conn.execute('BEGIN IMMEDIATE')
+                for job, after, fut in batch:
+                    # savepoint per job, so failed job not rollbacks whole batch.
+                    await self.writer_conn.execute('SAVEPOINT job')
+                    try:
+                        result = await job(self.writer_conn)
+                    except Exception as e:
+                        await self.writer_conn.execute('ROLLBACK TO job')
+                        results.append((after, fut, None, e))
+                    else:
+                        results.append((after, fut, result, None))
+                    await self.writer_conn.execute('RELEASE job')
+                await self.writer_conn.execute('COMMIT')
+            except Exception as e:
+                self.log.error(f'writerLoop: batch of {str(len(batch))} jobs failed: {str(e)}')
+                try:
+                    if self.writer_conn.in_transaction:
+                        await self.writer_conn.execute('ROLLBACK')
+                except Exception as rollback_error:
+                    # writer must live, next batch rollbacks again.
+                    self.log.error(f'writerLoop: rollback failed: {str(rollback_error)}')
+                results = [(after, fut, None, e) for job, after, fut in batch]
+            self.log.debug(f'writerLoop: committed batch of {str(len(batch))} jobs.')
+            for after, fut, result, error in results:
+                if error is None and after:
+                    try:
+                        after(result)
+                    except Exception:
+                        self.log.exception('writerLoop: after commit callback failed.')
+                if fut.done():
+                    continue
+                if error is None:
+                    fut.set_result(result)
+                else:
+                    fut.set_exception(error)
+        self.log.debug('writerLoop: stopped.')
+
+    async def openConnection(self) -> aiosqlite.Connection:
+        '''openConnection: opens new DB connection.
+
+        Returns:
+            aiosqlite.Connection: opened connection.
+        '''
+        self.opened += 1  # reserve pool slot before await
+        try:
+            conn = await aiosqlite.connect(self.db_name)
+        except Exception:
+            self.opened -= 1
+            raise
+        conn.row_factory = aiosqlite.Row
+        self.log.debug(f'openConnection: opened connection #{str(self.opened)}.')
+        return conn
+
+    async def closeConnection(self, conn: aiosqlite.Connection) -> None:
+        '''closeConnection: closes provided connection and forget it.
+
+        Args:
+            conn (aiosqlite.Connection): connection.
+        '''
+        self.last_used.pop(conn, None)
+        self.opened -= 1
+        try:
+            await conn.close()
+        except Exception as e:
+            self.log.warning(f'closeConnection: error while closing connection: {str(e)}')
+
+    async def ping(self, conn: aiosqlite.Connection) -> bool:
+        '''ping: health check for provided connection.
+
+        Args:
+            conn (aiosqlite.Connection): connection.
+
+        Returns:
+            bool: True if connection is alive.
+        '''
+        try:
+            async with conn.execute('SELECT 1') as cur:
+                await cur.fetchone()
+        except Exception as e:
+            self.log.warning(f'ping: connection is dead: {str(e)}')
+            return False
+        return True
+
+    async def borrow(self) -> aiosqlite.Connection:
+        '''borrow: returns idle connection from pool, opens new one if pool is not full yet.
+
+        Raises:
+            ConnectionError: pool was closed while waiting for connection.
+
+        Returns:
+            aiosqlite.Connection: connection.
+        '''
+        if self.pool is None:
+            await self.connect()
+        pool = self.pool
+        while True:
+            if pool.empty() and self.opened < self.pool_size:
+                return await self.openConnection()
+            conn = await pool.get()
+            if conn is POOL_CLOSED:
+                pool.put_nowait(conn)
+                raise ConnectionError('DB pool is closed.')
+            if conn is SLOT_FREED:
+                continue
+            if (time.monotonic() - self.last_used.get(conn, 0)) < self.ping_interval:
+                return conn
+            if await self.ping(conn):
+                return conn
+            await self.closeConnection(conn)
+
+    async def release(self, conn: aiosqlite.Connection, broken: bool = False) -> None:
+        '''release: returns connection to pool.
+
+        Args:
+            conn (aiosqlite.Connection): borrowed connection.
+            broken (bool, optional): connection raised error while used. Defaults to False.
+        '''
+        if broken:
+            try:
+                await conn.rollback()
+            except Exception:
+                await self.closeConnection(conn)
+                if self.pool is not None:
+                    self.pool.put_nowait(SLOT_FREED)
+                return
+        if self.pool is None:
+            await self.closeConnection(conn)
+        else:
+            self.last_used[conn] = time.monotonic()
+            self.pool.put_nowait(conn)
+
+    @asynccontextmanager
+    async def acquire(self) -> typing.AsyncIterator[aiosqlite.Connection]:
+        '''acquire: async context manager, borrows connection from pool and returns it back.
+
+        Yields:
+            aiosqlite.Connection: connection.
+        '''
+        conn = await self.borrow()
+        try:
+            yield conn
+        except BaseException:
+            await self.release(conn, True)
+            raise
+        else:
+            await self.release(conn)
+
+    async def checkQueryPlans(self, db: aiosqlite.Connection) -> int:
+        '''checkQueryPlans: checks by "EXPLAIN QUERY PLAN" what INDEXED_QUERIES not scans tables.
+
+        Args:
+            db (aiosqlite.Connection): DB connection.
+
+        Raises:
+            QueryPlanError: some queries scans table.
+
+        Returns:
+            int: checked queries count.
+        '''
+        failed = []
+        for sql, params in self.INDEXED_QUERIES:
+            async with db.execute(f'EXPLAIN QUERY PLAN {sql}', params) as cur:
+                plan = [row[-1] for row in await cur.fetchall()]
+            self.log.debug(f'checkQueryPlans - {sql}: {str(plan)}')
+            # scan of materialized subquery is scan of its result, not of table.
+            subqueries = {step.split()[-1] for step in plan if step.startswith('MATERIALIZE')}
+            for step in plan:
+                if not step.startswith('SCAN') or step.split()[1] in subqueries:
+                    continue
+                # FTS5 table scan with MATCH constraint is index lookup, index 0 is full scan.
+                if ' VIRTUAL TABLE INDEX ' in step and not step.split(' VIRTUAL TABLE INDEX ')[1].startswith('0:'):
+                    continue
+                self.log.error(f'checkQueryPlans - query not uses index: {sql}; plan: {str(plan)}')
+                failed.append(sql)
+                break
+        if failed:
+            raise QueryPlanError(f'{str(len(failed))} queries not uses index: {"; ".join(failed)}')
+        return len(self.INDEXED_QUERIES)
 
     async def getLessonsWithTimeByDate(self, array: list, date: str) -> typing.Optional[typing.Union[list, None]]:
         '''getLessonsWithTimeByDate: returns array of lessons with setted time by date typestimes.
@@ -60,8 +449,7 @@ class Database:
             list: array with names of lessons.
         '''
         lessons = []
-        async with aiosqlite.connect(self.db_name) as db:
-            db.row_factory = aiosqlite.Row
+        async with self.acquire() as db:
             async with db.execute('SELECT lesson_name FROM aliases') as cur:
                 async for row in cur:
                     name = dict(row)['lesson_name']
@@ -82,52 +470,63 @@ class Database:
         lessons = []
         weektype = utils.getWeektypeByDate(date)
         weekday = utils.getDateWeekday(date)
-        async with aiosqlite.connect(self.db_name) as db:
-            db.row_factory = aiosqlite.Row
+        async with self.acquire() as db:
             async with db.execute('SELECT name, type FROM default_lessons WHERE weekday=? AND week=?', (weekday, weektype)) as cur:
                 async for row in cur:
                     lessons.append(dict(row))
         return lessons
 
-    async def getLessonsByDate(self, date: str, parse: bool = False) -> list:
-        '''getLessonsByDate: Returns array with lessons by provided date.
+    async def getDay(self, date: str, parse: bool = False) -> list:
+        '''getDay: Returns array with lessons and their times by provided date, in one query.
 
         Args:
             date (str): date in ISO format (YYYY-MM-DD).
-            parse (bool): use isLessonPassed func at each lesson or not. Defaults to False.
+            parse (bool): returns only not passed lessons (like isLessonPassed). Defaults to False.
 
         Returns:
-            list: lessons array.
+            list: lessons array sorted by type, empty if lessons or types times not set.
         '''
-        self.log.debug(f'called "getLessonsByDate" with args: ({str(date)})')
-        array = []
-        async with aiosqlite.connect(self.db_name) as db:
-            db.row_factory = aiosqlite.Row
-            async with db.execute('SELECT * FROM lessons WHERE date=?', (date,)) as cur:
-                async for row in cur:
-                    lesson = dict(row)
-                    if parse:
-                        if utils.isLessonPassed(lesson) is False:
-                            array.append(lesson)
-                    else:
-                        array.append(lesson)
-        result = await self.getLessonsWithTimeByDate(array, date)
-        return result
-
-    async def visitLesson(self, lessonid: int, visit: int = 1) -> bool:
+        self.log.debug(f'called "getDay" with args: ({str(date)}, {str(parse)})')
+        day = self.cache.get(date, 'day')
+        if day is not DateCache.MISSING:
+            return utils.getNotPassedLessons(day) if parse else day
+        generation = self.cache.generation(date)
+        sql = self.DAY_QUERY
+        params = (date, date)
+        if parse:
+            sql += self.DAY_PARSE_FILTER
+            params += (utils.getNowDate() + ' ' + utils.getNowTime(),)
+        async with self.acquire() as db:
+            async with db.execute(sql + ' ORDER BY l.type', params) as cur:
+                day = [dict(row) for row in await cur.fetchall()]
+        if not parse:
+            self.cache.set(date, 'day', day, generation)
+        return day
+
+    async def visitLesson(self, lessonid: int, visit: int = 1,
+                          wait: bool = True) -> typing.Optional[typing.Union[bool, asyncio.Future]]:
         '''visitLesson: Set True or False in visit for lesson.
 
         Args:
             lessonid (int): Lesson ID.
             visit (int): lesson visit state. Defaults in 1.
+            wait (bool): wait for commit. Defaults to True.
 
         Returns:
-            bool: True if success.
+            typing.Optional[typing.Union[bool, asyncio.Future]]: True if success, or write future if not wait.
         '''
         self.log.debug(f'called "visitLesson" with args: ({str(lessonid)}, {str(visit)})')
-        async with aiosqlite.connect(self.db_name) as db:
+
+        async def job(db: aiosqlite.Connection) -> typing.Optional[str]:
+            async with db.execute('SELECT date FROM lessons WHERE _rowid_=?', (lessonid,)) as cur:
+                lesson = await cur.fetchone()
             await db.execute('UPDATE lessons SET visit=? WHERE _rowid_=?', (visit, lessonid))
-            await db.commit()
+            return lesson['date'] if lesson else None
+
+        fut = await self.submit(job, lambda date: self.events.publish(VisitRecorded(lessonid, date, visit)))
+        if not wait:
+            return fut
+        await fut
         return True
 
     async def addLesson(self, name: str, type: int, date: str) -> bool:
@@ -142,11 +541,32 @@ class Database:
             bool: True if success.
         '''
         self.log.debug(f'called "addLesson" with args: ({str(name)}, {str(type)}, {str(date)})')
-        lesson = (name, type, date, 0, None)
-        async with aiosqlite.connect(self.db_name) as db:
-            await db.execute('INSERT INTO lessons VALUES(?,?,?,?,?)', lesson)
-            await db.commit()
-        return True
+        return await self.addLessons(({'name': name, 'type': type, 'date': date},))
+
+    async def addLessons(self, lessons: typing.Iterable[dict], replace: bool = False,
+                         dates: typing.Optional[typing.Iterable[str]] = None) -> bool:
+        '''addLessons: Add lessons to DB in one transaction.
+
+        Args:
+            lessons (typing.Iterable[dict]): lessons dicts with "name", "type", "date" and optional "info" keys.
+            replace (bool, optional): delete lessons already set for these dates before insert. Defaults to False.
+            dates (typing.Optional[typing.Iterable[str]], optional): dates what lessons are replaced for,
+                so day without lessons can be replaced too. Defaults to dates of lessons.
+
+        Returns:
+            bool: True if success.
+        '''
+        rows = [(i['name'], i['type'], i['date'], 0, i.get('info')) for i in lessons]
+        self.log.debug(f'called "addLessons" with args: ({str(rows)}, {str(replace)}, {str(dates)})')
+        dates = {i[2] for i in rows} | set(dates or ())
+
+        async def job(db: aiosqlite.Connection) -> bool:
+            if replace:
+                await db.executemany('DELETE FROM lessons WHERE date=?', [(i,) for i in dates])
+            await db.executemany('INSERT INTO lessons VALUES(?,?,?,?,?)', rows)
+            return True
+
+        return await self.write(job, lambda _: [self.events.publish(LessonsChanged(i)) for i in dates])
 
     async def setLessonsTypesTimes(
             self, date: str = utils.getNextDate(),
@@ -174,10 +594,12 @@ class Database:
             f'called "setLessonsTypesTimes" with args: ({str(date)}, {str(start1)}, {str(end1)}, '
             f'{str(start2)}, {str(end2)}, {str(start3)}, {str(end3)}, {str(start4)}, {str(end4)})')
         types_times = (date, start1, end1, start2, end2, start3, end3, start4, end4)
-        async with aiosqlite.connect(self.db_name) as db:
+
+        async def job(db: aiosqlite.Connection) -> bool:
             await db.execute('INSERT INTO types_times VALUES(?,?,?,?,?,?,?,?,?)', types_times)
-            await db.commit()
-        return True
+            return True
+
+        return await self.write(job, lambda _: self.events.publish(TimetableChanged(date)))
 
     async def getTimesForType(
             self, type: int,
@@ -192,17 +614,12 @@ class Database:
             typing.Optional[typing.Union[tuple, None]]: array with start and end times for type and date, or None if times not set.
         '''
         self.log.debug(f'called "getTimesForType" with args: ({str(type)}, {str(date)})')
-        async with aiosqlite.connect(self.db_name) as db:
-            db.row_factory = aiosqlite.Row
-            req = (date,)
-            times = await db.execute('SELECT * FROM types_times WHERE date=?', req)
-            async for row in times:
-                row = dict(row)
-                self.log.debug(f'getTimesForType row: {str(row)}')
-                if row:
-                    return (row['start' + str(type)], row['end' + str(type)])
-                else:
-                    return None
+        row = await self.getTypesTimesByDate(date)
+        self.log.debug(f'getTimesForType row: {str(row)}')
+        if row:
+            return (row['start' + str(type)], row['end' + str(type)])
+        else:
+            return None
 
     async def getTypesTimesByDate(self, date: str) -> typing.Optional[typing.Union[dict, None]]:
         '''getTypesTimesByDate: Returns dict with date and types times
@@ -214,14 +631,16 @@ class Database:
             Optional[Union[dict, None]]: types times or None if types times not set for provided date.
         '''
         self.log.debug(f'called "getTypesTimesByDate" with args: ({str(date)})')
-        async with aiosqlite.connect(self.db_name) as db:
-            db.row_factory = aiosqlite.Row
+        times = self.cache.get(date, 'times')
+        if times is not DateCache.MISSING:
+            return times
+        generation = self.cache.generation(date)
+        async with self.acquire() as db:
             times = await db.execute('SELECT * FROM types_times WHERE date=?', (date,))
             times = await times.fetchone()
-            if times:
-                return dict(times)
-            else:
-                return None
+        times = dict(times) if times else None
+        self.cache.set(date, 'times', times, generation)
+        return times
 
     async def getLessonByAlias(self, alias: str) -> typing.Optional[typing.Union[str, None]]:
         '''getLessonByAlias: Returns lesson name by him alias.
@@ -233,8 +652,7 @@ class Database:
             typing.Optional[typing.Union[str, None]]: lesson name or None if alias not found.
         '''
         self.log.debug(f'called "getLessonByAlias" with args: ({str(alias)})')
-        async with aiosqlite.connect(self.db_name) as db:
-            db.row_factory = aiosqlite.Row
+        async with self.acquire() as db:
             fetch = await db.execute('SELECT lesson_name FROM aliases WHERE alias=?', (alias,))
             lesson_name = await fetch.fetchone()
             if lesson_name:
@@ -252,8 +670,7 @@ class Database:
             typing.Optional[typing.Union[dict, None]]: dict with teacher info or None, if lesson_name not found.
         '''
         self.log.debug(f'called "getTeacherByLessonName" with args: ({str(lesson_name)})')
-        async with aiosqlite.connect(self.db_name) as db:
-            db.row_factory = aiosqlite.Row
+        async with self.acquire() as db:
             fetch = await db.execute('SELECT * FROM teachers WHERE lesson_name=?', (lesson_name,))
             teacher = await fetch.fetchone()
             if teacher:
@@ -261,81 +678,73 @@ class Database:
             else:
                 return None
 
-    async def searchTeacher(self, data: str = None) -> typing.Optional[typing.Union[list, dict, None]]:
-        '''searchTeacher: Returns teachers list or just teacher dict by some data.
+    def getPeopleQuery(self, data: str) -> str:
+        '''getPeopleQuery: returns FTS5 query what matches all words of data by prefix, as typed or by lemma.
 
         Args:
-            data (str): teacher data. Defaults to None.
+            data (str): search text.
 
         Returns:
-            typing.Optional[typing.Union[list, dict, None]]: Teachers list or just teacher dict or None if not found.
+            str: FTS5 MATCH query, empty if data has no words.
         '''
-        if (data is None):
-            self.log.debug('called "searchTeacher" with not args.')
-            return None
-        else:
-            self.log.debug(f'called "searchTeacher" with arg: data: {str(data)}')
-            async with aiosqlite.connect(self.db_name) as db:
-                db.row_factory = aiosqlite.Row
-                fetch = await db.execute('SELECT * FROM teachers WHERE '
-                                         'last_name=? OR first_name=? OR '
-                                         'second_name=? OR lesson_name=?',
-                                         (data, data, data, data))
-                teachers = []
-                teacher = await fetch.fetchall()
-                if teacher:
-                    if len(teacher) > 1:
-                        for i in teacher:
-                            teachers.append(dict(i))
-                        return teachers
-                    else:
-                        return dict(teacher[0])
-                else:
-                    lesson_name = await self.getLessonByAlias(data)
-                    if lesson_name:
-                        fetch = await db.execute('SELECT * FROM teachers '
-                                                 'WHERE lesson_name=?',
-                                                 (lesson_name,))
-                        fetch = await fetch.fetchall()
-                        if fetch:
-                            teacher = fetch
-                            if len(teacher) > 1:
-                                for i in teacher:
-                                    teachers.append(dict(i))
-                                return teachers
-                            else:
-                                return dict(teacher[0])
-                    return None
+        query = []
+        for word in data.split():
+            variants = [f'{{body}} : "{word.replace(chr(34), chr(34) * 2)}"*']
+            variants += [f'{{lemmas}} : "{i}"*' for i in utils.getLemmas(word).split() if i != word.lower()]
+            query.append(f'({" OR ".join(variants)})')
+        return ' AND '.join(query)
 
-    async def searchStudent(self, data: str = None) -> typing.Optional[typing.Union[list, dict, None]]:
-        '''searchStudent: returns students list or just student dict or None if not found.
+    async def searchPeople(self, data: str, limit: int = 10) -> list:
+        '''searchPeople: returns students and teachers ranked by relevance to data, in one index lookup.
 
         Args:
-            data (str, optional): student data. Defaults to None.
+            data (str): search text (names, alias, mobile, lesson name or alias).
+            limit (int, optional): max results. Defaults to 10.
 
         Returns:
-            typing.Optional[typing.Union[list, dict, None]]: students list or student dict or None
+            list: dicts of students and teachers, with "kind" key ("student" or "teacher").
         '''
-        if (data is None):
-            self.log.debug('called "searchStudent" with not args.')
-            return None
-        else:
-            self.log.debug(f'called "searchStudent" with arg: data: {str(data)}')
-            async with aiosqlite.connect(self.db_name) as db:
-                db.row_factory = aiosqlite.Row
-                fetch = await db.execute('SELECT * FROM students WHERE first_name=? OR alias=? '
-                                         'OR last_name=? OR second_name=? OR mobile=?', (data, data, data, data, data))
-                fetch = await fetch.fetchall()
-                if fetch:
-                    if len(fetch) > 1:
-                        students = []
-                        for i in fetch:
-                            students.append(dict(i))
-                        return students
-                    else:
-                        return dict(fetch[0])
-                else:
-                    return None
+        self.log.debug(f'called "searchPeople" with args: ({str(data)}, {str(limit)})')
+        query = self.getPeopleQuery(data)
+        if not query:
+            return []
+        async with self.acquire() as db:
+            async with db.execute(self.PEOPLE_QUERY, (query, limit)) as cur:
+                hits = [(i['kind'], i['ref']) for i in await cur.fetchall()]
+            ids = {'student': [i[1] for i in hits if i[0] == 'student'],
+                   'teacher': [i[1] for i in hits if i[0] == 'teacher'],
+                   'alias': [i[1] for i in hits if i[0] == 'alias']}
+            found = {}
+            marks = ','.join('?' * len(ids['student']))
+            async with db.execute(f'SELECT _rowid_ AS ref, * FROM students WHERE _rowid_ IN ({marks})',
+                                  ids['student']) as cur:
+                for i in await cur.fetchall():
+                    found[('student', i['ref'])] = dict(i)
+            marks = ','.join('?' * len(ids['teacher']))
+            async with db.execute(f'SELECT _rowid_ AS ref, * FROM teachers WHERE _rowid_ IN ({marks})',
+                                  ids['teacher']) as cur:
+                for i in await cur.fetchall():
+                    found[('teacher', i['ref'])] = dict(i)
+            # alias hit means teachers of aliased lesson.
+            marks = ','.join('?' * len(ids['alias']))
+            async with db.execute('SELECT a._rowid_ AS alias_ref, t._rowid_ AS ref, t.* FROM aliases AS a '
+                                  'JOIN teachers AS t ON t.lesson_name = a.lesson_name '
+                                  f'WHERE a._rowid_ IN ({marks})', ids['alias']) as cur:
+                for i in await cur.fetchall():
+                    found.setdefault(('alias', i['alias_ref']), []).append(dict(i))
+        people = []
+        seen = set()
+        for kind, ref in hits:
+            rows = found.get((kind, ref), [])
+            for row in rows if type(rows) is list else [rows]:
+                row.pop('alias_ref', None)
+                key = ('student' if kind == 'student' else 'teacher', row['ref'])
+                if key in seen:
+                    continue
+                seen.add(key)
+                row['kind'] = key[0]
+                people.append(row)
+        return people[:limit]
 
     async def getLessonID(self, lesson: dict) -> typing.Optional[typing.Union[int, None]]:
         '''getLessonID: returns lesson rowid.
@@ -347,8 +756,7 @@ class Database:
             typing.Optional[typing.Union[int, None]]: lesson rowid in DB or None.
         '''
         self.log.debug(f'getLessonID called with arg - lesson: {str(lesson)}')
-        async with aiosqlite.connect(self.db_name) as db:
-            db.row_factory = aiosqlite.Row
+        async with self.acquire() as db:
             fetch = await db.execute('SELECT _rowid_ FROM lessons WHERE name=? AND date=?', (lesson['name'], lesson['date']))
             fetch = await fetch.fetchone()
             if fetch:
@@ -366,8 +774,7 @@ class Database:
             typing.Optional[typing.Union[dict, None]]: lesson dict, or None.
         '''
         self.log.debug(f'getLessonByID called with arg - lessonid: {str(lessonid)}')
-        async with aiosqlite.connect(self.db_name) as db:
-            db.row_factory = aiosqlite.Row
+        async with self.acquire() as db:
             fetch = await db.execute('SELECT * FROM lessons WHERE _rowid_=?', (lessonid,))
             fetch = await fetch.fetchone()
             if fetch:
@@ -388,6 +795,43 @@ class Database:
             bool: True (always).
         '''
         self.log.debug(f'addTeacher called with args - full_name: {full_name}, lesson_name: {lesson_name}, verify: {str(verify)}, op: {op}')
+        sql, vars = self.getTeacherInsert(full_name, lesson_name, verify, op)
+
+        async def job(db: aiosqlite.Connection) -> bool:
+            await db.execute(sql, vars)
+            await self.fillPeopleLemmas(db)
+            return True
+
+        return await self.write(job)
+
+    async def fillPeopleLemmas(self, db: aiosqlite.Connection) -> int:
+        '''fillPeopleLemmas: computes lemmas of people index rows what has none, write job.
+
+        Args:
+            db (aiosqlite.Connection): writer connection.
+
+        Returns:
+            int: count of filled rows.
+        '''
+        async with db.execute('SELECT rowid, body FROM people WHERE lemmas IS NULL') as cur:
+            rows = await cur.fetchall()
+        if rows:
+            await db.executemany('UPDATE people SET lemmas=? WHERE rowid=?',
+                                 [(utils.getLemmas(row[1]), row[0]) for row in rows])
+        return len(rows)
+
+    def getTeacherInsert(self, full_name: str, lesson_name: str, verify: int = 1, op: str = 'Преподователь') -> tuple:
+        '''getTeacherInsert: returns SQL and its vars for insert teacher.
+
+        Args:
+            full_name (str): teacher full name.
+            lesson_name (str): teacher lesson name
+            verify (int, optional): teacher verified? Defaults to 1.
+            op (str, optional): teacher as is. Defaults to 'Преподователь'.
+
+        Returns:
+            tuple: SQL and vars.
+        '''
         teacher_name = utils.parseTeacherName(full_name)
         if len(teacher_name.keys()) == 3:
             sql = 'INSERT INTO teachers VALUES(?, ?, ?, ?, ?, ?)'
@@ -400,10 +844,7 @@ class Database:
                 if teacher_name['first_name']:
                     sql = 'INSERT INTO teachers (op, lesson_name, first_name, verify) VALUES (?,?,?,?)'
                     vars = (op, lesson_name, teacher_name['first_name'])
-        async with aiosqlite.connect(self.db_name) as db:
-            await db.execute(sql, vars)
-            await db.commit()
-        return True
+        return sql, vars
 
     async def getPractice(self,
                           date: typing.Optional[typing.Union[str, None]] = None,
@@ -420,8 +861,7 @@ class Database:
             typing.Optional[typing.Union[dict, None]]: practice dict or None if not found.
         '''
         self.log.debug(f'getPractice called with args - date: {date}, start_date: {start_date}, rowid: {str(rowid)}.')
-        async with aiosqlite.connect(self.db_name) as db:
-            db.row_factory = aiosqlite.Row
+        async with self.acquire() as db:
             if rowid:
                 cur = await db.execute('SELECT * FROM practices WHERE _rowid_=?', (rowid,))
                 practice = await cur.fetchone()
@@ -462,8 +902,7 @@ class Database:
             typing.Optional[typing.Union[dict, None]]: practice dict or None if not found.
         '''
         self.log.debug('getLastPractice is called.')
-        async with aiosqlite.connect(self.db_name) as db:
-            db.row_factory = aiosqlite.Row
+        async with self.acquire() as db:
             cur = await db.execute('SELECT * FROM practices')
             fetch = await cur.fetchall()
             practices = []
@@ -484,8 +923,7 @@ class Database:
             typing.Optional[int, None]: practice number or None if not found.
         '''
         self.log.debug(f'getPracticeNum called with arg - practice: {str(practice)}')
-        async with aiosqlite.connect(self.db_name) as db:
-            db.row_factory = aiosqlite.Row
+        async with self.acquire() as db:
             cur = await db.execute('SELECT _rowid_ FROM practices WHERE start_date=?', (practice['start_date'],))
             fetch = await cur.fetchone()
             if fetch:
@@ -508,11 +946,14 @@ class Database:
         '''
         self.log.debug(
             f'startPractice is called with args - mode: {str(mode)}, date: {date}, timeFrom: {timeFrom}, timeTo: {timeTo}, teacher: {teacher}')
-        await self.addTeacher(teacher, 'Практика')
-        async with aiosqlite.connect(self.db_name) as db:
+        sql, vars = self.getTeacherInsert(teacher, 'Практика')
+
+        async def job(db: aiosqlite.Connection) -> bool:
+            await db.execute(sql, vars)
             await db.execute('INSERT INTO practices (status, start_date, timeFrom, timeTo) VALUES (?,?,?,?)', (int(mode), date, timeFrom, timeTo))
-            await db.commit()
-        return True
+            return True
+
+        return await self.write(job, lambda _: self.events.publish(PracticeStarted(date)))
 
     async def endPractice(self, date: str, end_date: str) -> bool:
         '''endPractice: set practice mode to False by provided "date" vars.
@@ -526,7 +967,259 @@ class Database:
         '''
         self.log.debug(
             f'setPracticeMode called with args - date: {date}, end_date: {end_date}')
-        async with aiosqlite.connect(self.db_name) as db:
+
+        async def job(db: aiosqlite.Connection) -> bool:
             await db.execute('UPDATE practices SET status=? AND end_date=? WHERE start_date=?', (0, end_date, date))
-            await db.commit()
-        return True
+            return True
+
+        return await self.write(job, lambda _: self.events.publish(PracticeEnded(date, end_date)))
+
+    async def getSubscribers(self) -> list:
+        '''getSubscribers: returns chat ids of notifications subscribers.
+
+        Returns:
+            list: chat ids.
+        '''
+        async with self.acquire() as db:
+            async with db.execute('SELECT chat_id FROM subscribers') as cur:
+                return [row['chat_id'] for row in await cur.fetchall()]
+
+    async def addSubscriber(self, chat_id: int, mention: str = None) -> bool:
+        '''addSubscriber: subscribes chat to notifications.
+
+        Args:
+            chat_id (int): telegram chat id.
+            mention (str, optional): chat mention. Defaults to None.
+
+        Returns:
+            bool: True if chat was subscribed, False if it already subscribed.
+        '''
+        self.log.debug(f'addSubscriber called with args - chat_id: {str(chat_id)}, mention: {str(mention)}')
+
+        async def job(db: aiosqlite.Connection) -> bool:
+            cur = await db.execute('INSERT OR IGNORE INTO subscribers (chat_id, mention) VALUES (?,?)', (chat_id, mention))
+            return cur.rowcount > 0
+
+        return await self.write(job)
+
+    async def removeSubscriber(self, chat_id: int) -> bool:
+        '''removeSubscriber: unsubscribes chat from notifications.
+
+        Args:
+            chat_id (int): telegram chat id.
+
+        Returns:
+            bool: True if chat was unsubscribed, False if it was not subscribed.
+        '''
+        self.log.debug(f'removeSubscriber called with args - chat_id: {str(chat_id)}')
+
+        async def job(db: aiosqlite.Connection) -> bool:
+            cur = await db.execute('DELETE FROM subscribers WHERE chat_id=?', (chat_id,))
+            return cur.rowcount > 0
+
+        return await self.write(job)
+
+    async def getSentAlerts(self, lesson_ids: typing.Iterable[int]) -> set:
+        '''getSentAlerts: returns already sent timer alerts of lessons.
+
+        Args:
+            lesson_ids (typing.Iterable[int]): lessons ids.
+
+        Returns:
+            set: (lesson id, alert kind) tuples.
+        '''
+        lesson_ids = list(lesson_ids)
+        if not lesson_ids:
+            return set()
+        async with self.acquire() as db:
+            async with db.execute(f'SELECT lesson_id, kind FROM sent_alerts WHERE lesson_id IN ({",".join("?" * len(lesson_ids))})',
+                                  lesson_ids) as cur:
+                return {(row['lesson_id'], row['kind']) for row in await cur.fetchall()}
+
+    async def addSentAlerts(self, alerts: typing.Iterable[tuple]) -> bool:
+        '''addSentAlerts: logs sent timer alerts, already logged are ignored.
+
+        Args:
+            alerts (typing.Iterable[tuple]): (lesson id, alert kind) tuples.
+
+        Returns:
+            bool: True if success.
+        '''
+        alerts = list(alerts)
+        self.log.debug(f'addSentAlerts called with args - alerts: {str(alerts)}')
+
+        async def job(db: aiosqlite.Connection) -> bool:
+            await db.executemany('INSERT OR IGNORE INTO sent_alerts (lesson_id, kind) VALUES (?,?)', alerts)
+            return True
+
+        return await self.write(job)
+
+    async def getTimerAlive(self) -> typing.Optional[float]:
+        '''getTimerAlive: returns time what timer was alive last.
+
+        Returns:
+            typing.Optional[float]: timestamp, None if timer never worked with this DB.
+        '''
+        async with self.acquire() as db:
+            async with db.execute('SELECT alive_at FROM timer_alive WHERE id=?', (0,)) as cur:
+                row = await cur.fetchone()
+        return row['alive_at'] if row else None
+
+    async def setTimerAlive(self, alive_at: float) -> bool:
+        '''setTimerAlive: stores time what timer was alive last.
+
+        Args:
+            alive_at (float): timestamp.
+
+        Returns:
+            bool: True if success.
+        '''
+        async def job(db: aiosqlite.Connection) -> bool:
+            await db.execute('INSERT OR REPLACE INTO timer_alive (id, alive_at) VALUES (?,?)', (0, alive_at))
+            return True
+
+        return await self.write(job)
+
+    async def getZamenaPages(self, pdf: str) -> list:
+        '''getZamenaPages: returns pages hashes of zamena PDF.
+
+        Args:
+            pdf (str): PDF pages key (PDF sha256 and encoding profile).
+
+        Returns:
+            list: pages hashes in pages order, empty if PDF pages are not known.
+        '''
+        async with self.acquire() as db:
+            async with db.execute('SELECT hash FROM zamena_pages WHERE pdf=? ORDER BY page', (pdf,)) as cur:
+                return [row['hash'] for row in await cur.fetchall()]
+
+    async def setZamenaPages(self, pdf: str, hashes: typing.List[str]) -> bool:
+        '''setZamenaPages: stores pages hashes of zamena PDF.
+
+        Args:
+            pdf (str): PDF pages key (PDF sha256 and encoding profile).
+            hashes (typing.List[str]): pages hashes in pages order.
+
+        Returns:
+            bool: True if success.
+        '''
+        async def job(db: aiosqlite.Connection) -> bool:
+            await db.execute('DELETE FROM zamena_pages WHERE pdf=?', (pdf,))
+            await db.executemany('INSERT INTO zamena_pages (pdf, page, hash) VALUES (?,?,?)',
+                                 [(pdf, num, i) for num, i in enumerate(hashes)])
+            return True
+
+        return await self.write(job)
+
+    async def getZamenaFileIds(self, hashes: typing.Iterable[str]) -> dict:
+        '''getZamenaFileIds: returns telegram file ids of already uploaded zamena pages.
+
+        Args:
+            hashes (typing.Iterable[str]): pages hashes.
+
+        Returns:
+            dict: page hash -> telegram file id, only for uploaded pages.
+        '''
+        hashes = list(set(hashes))
+        if not hashes:
+            return {}
+        async with self.acquire() as db:
+            async with db.execute(f'SELECT hash, file_id FROM zamena_files WHERE hash IN ({",".join("?" * len(hashes))})',
+                                  hashes) as cur:
+                return {row['hash']: row['file_id'] for row in await cur.fetchall()}
+
+    async def addZamenaFileIds(self, file_ids: dict) -> bool:
+        '''addZamenaFileIds: stores telegram file ids of uploaded zamena pages.
+
+        Args:
+            file_ids (dict): page hash -> telegram file id.
+
+        Returns:
+            bool: True if success.
+        '''
+        self.log.debug(f'addZamenaFileIds called with args - file_ids: {str(file_ids)}')
+
+        async def job(db: aiosqlite.Connection) -> bool:
+            await db.executemany('INSERT OR REPLACE INTO zamena_files (hash, file_id) VALUES (?,?)', list(file_ids.items()))
+            return True
+
+        return await self.write(job)
+
+    async def removeZamenaFileIds(self, hashes: typing.Iterable[str]) -> bool:
+        '''removeZamenaFileIds: forgets telegram file ids of zamena pages, like ids of other bot.
+
+        Args:
+            hashes (typing.Iterable[str]): pages hashes.
+
+        Returns:
+            bool: True if success.
+        '''
+        hashes = list(hashes)
+        self.log.debug(f'removeZamenaFileIds called with args - hashes: {str(hashes)}')
+
+        async def job(db: aiosqlite.Connection) -> bool:
+            await db.executemany('DELETE FROM zamena_files WHERE hash=?', [(i,) for i in hashes])
+            return True
+
+        return await self.write(job)
+
+    async def getZamenaSent(self, chat_id: int) -> typing.Optional[str]:
+        '''getZamenaSent: returns zamena PDF what was sent to chat last time.
+
+        Args:
+            chat_id (int): telegram chat id.
+
+        Returns:
+            typing.Optional[str]: PDF sha256, None if zamena was not sent to chat.
+        '''
+        async with self.acquire() as db:
+            async with db.execute('SELECT pdf FROM zamena_sent WHERE chat_id=?', (chat_id,)) as cur:
+                row = await cur.fetchone()
+                return row['pdf'] if row else None
+
+    async def setZamenaSent(self, chat_id: int, pdf: str) -> bool:
+        '''setZamenaSent: stores zamena PDF what was sent to chat.
+
+        Args:
+            chat_id (int): telegram chat id.
+            pdf (str): PDF sha256.
+
+        Returns:
+            bool: True if success.
+        '''
+        async def job(db: aiosqlite.Connection) -> bool:
+            await db.execute('INSERT OR REPLACE INTO zamena_sent (chat_id, pdf) VALUES (?,?)', (chat_id, pdf))
+            return True
+
+        return await self.write(job)
+
+    async def getZamenaRecords(self, pdf: str) -> typing.Optional[list]:
+        '''getZamenaRecords: returns replacements parsed from zamena PDF.
+
+        Args:
+            pdf (str): PDF sha256.
+
+        Returns:
+            typing.Optional[list]: replacements records, None if PDF is not parsed.
+        '''
+        async with self.acquire() as db:
+            async with db.execute('SELECT records FROM zamena_records WHERE pdf=?', (pdf,)) as cur:
+                row = await cur.fetchone()
+                return json.loads(row['records']) if row else None
+
+    async def setZamenaRecords(self, pdf: str, records: list) -> bool:
+        '''setZamenaRecords: stores replacements parsed from zamena PDF.
+
+        Args:
+            pdf (str): PDF sha256.
+            records (list): replacements records.
+
+        Returns:
+            bool: True if success.
+        '''
+        async def job(db: aiosqlite.Connection) -> bool:
+            await db.execute('INSERT OR REPLACE INTO zamena_records (pdf, records) VALUES (?,?)',
+                             (pdf, json.dumps(records, ensure_ascii=False)))
+            return True
+
+        return await self.write(job)
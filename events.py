@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+#
+#  TeachTime module "events".
+#  Created by LulzLoL231 at 2026/10/18
+#
+import asyncio
+import logging
+import typing
+
+
+class LessonsChanged(typing.NamedTuple):
+    '''LessonsChanged: lessons of date are added or replaced.'''
+    date: str
+
+
+class TimetableChanged(typing.NamedTuple):
+    '''TimetableChanged: lessons types times of date are set.'''
+    date: str
+
+
+class VisitRecorded(typing.NamedTuple):
+    '''VisitRecorded: lesson visit state is set.'''
+    lesson_id: int
+    date: typing.Optional[str]
+    visit: int
+
+
+class PracticeStarted(typing.NamedTuple):
+    '''PracticeStarted: practice is started.'''
+    date: str
+
+
+class PracticeEnded(typing.NamedTuple):
+    '''PracticeEnded: practice is ended.'''
+    date: str
+    end_date: str
+
+
+class CurrentLessonChanged(typing.NamedTuple):
+    '''CurrentLessonChanged: timer switched to other lesson, or to None.'''
+    lesson: typing.Optional[dict]
+
+
+class EventBus:
+    '''EventBus: in-process publish/subscribe bus.
+
+    Handlers are called in subscribe order with event as the only argument,
+    coroutine handlers are scheduled as tasks. Handler errors are logged
+    and never reach publisher.
+    '''
+    def __init__(self):
+        self.handlers = {}  # event type -> handlers list
+        self.tasks = set()  # running coroutine handlers
+        self.log = logging.getLogger('TeachTime EventBus')
+
+    def subscribe(self, event: type, handler: typing.Callable[[typing.Any], typing.Any]) -> None:
+        '''subscribe: adds handler for event type.
+
+        Args:
+            event (type): event type.
+            handler (typing.Callable[[typing.Any], typing.Any]): function or coroutine function.
+        '''
+        self.handlers.setdefault(event, []).append(handler)
+
+    def unsubscribe(self, event: type, handler: typing.Callable[[typing.Any], typing.Any]) -> bool:
+        '''unsubscribe: removes handler of event type.
+
+        Args:
+            event (type): event type.
+            handler (typing.Callable[[typing.Any], typing.Any]): subscribed handler.
+
+        Returns:
+            bool: True if handler was subscribed.
+        '''
+        handlers = self.handlers.get(event, [])
+        if handler in handlers:
+            handlers.remove(handler)
+            return True
+        return False
+
+    def publish(self, event: typing.Any) -> int:
+        '''publish: delivers event to all handlers of its type.
+
+        Args:
+            event (typing.Any): event instance.
+
+        Returns:
+            int: handlers count.
+        '''
+        handlers = list(self.handlers.get(type(event), []))
+        self.log.debug(f'publish: {str(event)} to {str(len(handlers))} handlers')
+        for handler in handlers:
+            try:
+                result = handler(event)
+            except Exception as e:
+                self.log.error(f'Handler {getattr(handler, "__qualname__", handler)} of {type(event).__name__} failed: {str(e)}')
+                continue
+            if asyncio.iscoroutine(result):
+                task = asyncio.ensure_future(result)
+                self.tasks.add(task)
+                task.add_done_callback(self.handlerDone)
+        return len(handlers)
+
+    def handlerDone(self, task: asyncio.Task) -> None:
+        '''handlerDone: logs error of coroutine handler.
+
+        Args:
+            task (asyncio.Task): handler task.
+        '''
+        self.tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            self.log.error(f'Handler task failed: {str(task.exception())}')
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+#
+#  TeachTime module "httpclient".
+#  Created by LulzLoL231 at 2026/10/18
+#
+import time
+import logging
+import typing
+from collections import deque
+from contextlib import asynccontextmanager
+
+import aiohttp
+
+from config import Config
+
+
+class HttpClient:
+    '''HttpClient: shared aiohttp session for outbound HTTP.
+
+    One session with pooled keep-alive connections and DNS cache is
+    opened on first request and reused by all requests until close.
+    Requests latency and connections reuse are counted for stats.
+
+    Args:
+        conf (Config): TeachTime config instance.
+    '''
+    def __init__(self, conf: Config):
+        self.pool_size = conf.HTTP_POOL_SIZE
+        self.keepalive = conf.HTTP_KEEPALIVE
+        self.dns_ttl = conf.HTTP_DNS_TTL
+        self.timeout = aiohttp.ClientTimeout(total=conf.HTTP_TIMEOUT, connect=conf.HTTP_CONNECT_TIMEOUT)
+        self.session = None  # aiohttp.ClientSession, opened on first request
+        self.latencies = deque(maxlen=100)  # last requests latency, seconds
+        self.counters = {'requests': 0, 'failed': 0, 'connected': 0, 'reused': 0, 'dns': 0}
+        self.log = logging.getLogger('TeachTime HttpClient')
+
+    def getSession(self) -> aiohttp.ClientSession:
+        '''getSession: returns shared session, opens it on first call.
+
+        Returns:
+            aiohttp.ClientSession: session.
+        '''
+        if self.session is None or self.session.closed:
+            trace = aiohttp.TraceConfig()
+            trace.on_connection_create_end.append(self.countTrace('connected'))
+            trace.on_connection_reuseconn.append(self.countTrace('reused'))
+            trace.on_dns_resolvehost_end.append(self.countTrace('dns'))
+            connector = aiohttp.TCPConnector(limit=self.pool_size, ttl_dns_cache=self.dns_ttl,
+                                             keepalive_timeout=self.keepalive)
+            self.session = aiohttp.ClientSession(connector=connector, timeout=self.timeout, trace_configs=[trace])
+        return self.session
+
+    def countTrace(self, counter: str) -> typing.Callable:
+        '''countTrace: returns aiohttp trace callback what increments counter.
+
+        Args:
+            counter (str): counter name.
+
+        Returns:
+            typing.Callable: trace callback.
+        '''
+        async def callback(session, ctx, params):
+            self.counters[counter] += 1
+        return callback
+
+    @asynccontextmanager
+    async def request(self, method: str, url: str, **kwargs) -> typing.AsyncIterator[aiohttp.ClientResponse]:
+        '''request: makes request with shared session, response is released on exit.
+
+        Args:
+            method (str): HTTP method.
+            url (str): URL.
+            **kwargs: aiohttp request kwargs.
+
+        Yields:
+            aiohttp.ClientResponse: response.
+        '''
+        start = time.monotonic()
+        self.counters['requests'] += 1
+        try:
+            async with self.getSession().request(method, url, **kwargs) as resp:
+                yield resp
+        except Exception:
+            self.counters['failed'] += 1
+            raise
+        finally:
+            secs = time.monotonic() - start
+            self.latencies.append(secs)
+            self.log.debug(f'{method} {url}: {str(round(secs * 1000, 1))} ms.')
+
+    def get(self, url: str, **kwargs) -> typing.AsyncContextManager[aiohttp.ClientResponse]:
+        '''get: makes GET request, like request.
+
+        Args:
+            url (str): URL.
+            **kwargs: aiohttp request kwargs.
+
+        Returns:
+            typing.AsyncContextManager[aiohttp.ClientResponse]: response context.
+        '''
+        return self.request('GET', url, **kwargs)
+
+    async def close(self) -> None:
+        '''close: closes session and its connections.
+        '''
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def stats(self) -> dict:
+        '''stats: returns client metrics.
+
+        Returns:
+            dict: counters and requests latency (ms) of last requests.
+        '''
+        latencies = sorted(self.latencies)
+        return {
+            **self.counters,
+            'latency_avg': round(sum(latencies) / len(latencies) * 1000, 1) if latencies else 0,
+            'latency_p95': round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 1) if latencies else 0,
+            'latency_max': round(latencies[-1] * 1000, 1) if latencies else 0,
+        }
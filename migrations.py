@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+#
+#  TeachTime module "migrations".
+#  Created by LulzLoL231 at 2026/10/18
+#
+import logging
+
+import aiosqlite
+
+
+log = logging.getLogger('TeachTime Migrations')
+# people index sources: (table, kind, rowid offset, body expression of "{row}" row).
+PEOPLE_SOURCES = (
+    ('students', 'student', 0,
+     "ifnull({row}last_name, '') || ' ' || ifnull({row}first_name, '') || ' ' || ifnull({row}second_name, '')"
+     " || ' ' || ifnull({row}alias, '') || ' ' || ifnull({row}mobile, '')"),
+    ('teachers', 'teacher', 1,
+     "ifnull({row}last_name, '') || ' ' || ifnull({row}first_name, '') || ' ' || ifnull({row}second_name, '')"
+     " || ' ' || ifnull({row}lesson_name, '') || ' ' || ifnull({row}op, '')"),
+    ('aliases', 'alias', 2, "ifnull({row}alias, '') || ' ' || ifnull({row}lesson_name, '')"),
+)
+
+
+def getPeopleLemmasScript() -> str:
+    '''getPeopleLemmasScript: returns script what rebuilds people index with "lemmas" column.
+    "lemmas" SQL function (utils.getLemmas) must be registered on connection.
+
+    Returns:
+        str: SQL script.
+    '''
+    script = ''
+    for table, kind, offset, body in PEOPLE_SOURCES:
+        script += f'''
+        DROP TRIGGER IF EXISTS people_{table}_insert;
+        DROP TRIGGER IF EXISTS people_{table}_delete;
+        DROP TRIGGER IF EXISTS people_{table}_update;'''
+    script += '''
+        DROP TABLE IF EXISTS people;
+        CREATE VIRTUAL TABLE people USING fts5 (
+            kind UNINDEXED, ref UNINDEXED, body, lemmas,
+            tokenize = 'unicode61 remove_diacritics 0', prefix = '2 3');'''
+    for table, kind, offset, body in PEOPLE_SOURCES:
+        new = body.format(row='new.')
+        insert = (f"INSERT INTO people (rowid, kind, ref, body, lemmas) VALUES "
+                  f"(new.rowid * 3 + {offset}, '{kind}', new.rowid, {new}, lemmas({new}));")
+        delete = f'DELETE FROM people WHERE rowid = old.rowid * 3 + {offset};'
+        script += f'''
+        CREATE TRIGGER people_{table}_insert AFTER INSERT ON {table} BEGIN
+            {insert}
+        END;
+        CREATE TRIGGER people_{table}_delete AFTER DELETE ON {table} BEGIN
+            {delete}
+        END;
+        CREATE TRIGGER people_{table}_update AFTER UPDATE ON {table} BEGIN
+            {delete}
+            {insert}
+        END;
+        INSERT INTO people (rowid, kind, ref, body, lemmas)
+            SELECT rowid * 3 + {offset}, '{kind}', rowid, {body.format(row='')}, lemmas({body.format(row='')})
+            FROM {table};'''
+    return script
+
+
+def getPeopleTriggersScript() -> str:
+    '''getPeopleTriggersScript: returns script what recreates people index triggers without "lemmas" SQL function.
+    Triggers leaves "lemmas" column NULL, writer fills it.
+
+    Returns:
+        str: SQL script.
+    '''
+    script = ''
+    for table, kind, offset, body in PEOPLE_SOURCES:
+        new = body.format(row='new.')
+        insert = (f"INSERT INTO people (rowid, kind, ref, body, lemmas) VALUES "
+                  f"(new.rowid * 3 + {offset}, '{kind}', new.rowid, {new}, NULL);")
+        delete = f'DELETE FROM people WHERE rowid = old.rowid * 3 + {offset};'
+        script += f'''
+        DROP TRIGGER IF EXISTS people_{table}_insert;
+        DROP TRIGGER IF EXISTS people_{table}_delete;
+        DROP TRIGGER IF EXISTS people_{table}_update;
+        CREATE TRIGGER people_{table}_insert AFTER INSERT ON {table} BEGIN
+            {insert}
+        END;
+        CREATE TRIGGER people_{table}_delete AFTER DELETE ON {table} BEGIN
+            {delete}
+        END;
+        CREATE TRIGGER people_{table}_update AFTER UPDATE ON {table} BEGIN
+            {delete}
+            {insert}
+        END;'''
+    return script
+
+
+# (version, name, script) - append only, never edit applied migrations.
+MIGRATIONS = (
+    (1, 'initial schema', '''
+        CREATE TABLE IF NOT EXISTS lessons (
+            name TEXT, type INTEGER, date TEXT, visit INTEGER DEFAULT 0, info TEXT);
+        CREATE TABLE IF NOT EXISTS types_times (
+            date TEXT,
+            start1 TEXT, end1 TEXT, start2 TEXT, end2 TEXT,
+            start3 TEXT, end3 TEXT, start4 TEXT, end4 TEXT);
+        CREATE TABLE IF NOT EXISTS default_lessons (
+            name TEXT, type INTEGER, weekday INTEGER, week INTEGER);
+        CREATE TABLE IF NOT EXISTS aliases (alias TEXT, lesson_name TEXT);
+        CREATE TABLE IF NOT EXISTS teachers (
+            op TEXT, lesson_name TEXT, last_name TEXT, first_name TEXT, second_name TEXT, verify INTEGER);
+        CREATE TABLE IF NOT EXISTS students (
+            first_name TEXT, second_name TEXT, last_name TEXT, alias TEXT, dob TEXT,
+            mobile TEXT, vk_id TEXT, father_mobile TEXT, mother_mobile TEXT,
+            address TEXT, aux_info TEXT, premium INTEGER DEFAULT 0);
+        CREATE TABLE IF NOT EXISTS practices (
+            status INTEGER, start_date TEXT, end_date TEXT, timeFrom TEXT, timeTo TEXT);
+    '''),
+    (2, 'hot lookups indexes', '''
+        CREATE INDEX IF NOT EXISTS lessons_date ON lessons (date, type, name, visit, info);
+        CREATE INDEX IF NOT EXISTS types_times_date ON types_times (date);
+        CREATE INDEX IF NOT EXISTS default_lessons_weekday_week ON default_lessons (weekday, week, type, name);
+        CREATE INDEX IF NOT EXISTS aliases_alias ON aliases (alias, lesson_name);
+        CREATE INDEX IF NOT EXISTS practices_start_date ON practices (start_date);
+        CREATE INDEX IF NOT EXISTS teachers_lesson_name ON teachers (lesson_name);
+        CREATE INDEX IF NOT EXISTS teachers_last_name ON teachers (last_name);
+        CREATE INDEX IF NOT EXISTS teachers_first_name ON teachers (first_name);
+        CREATE INDEX IF NOT EXISTS teachers_second_name ON teachers (second_name);
+        CREATE INDEX IF NOT EXISTS students_first_name ON students (first_name);
+        CREATE INDEX IF NOT EXISTS students_second_name ON students (second_name);
+        CREATE INDEX IF NOT EXISTS students_last_name ON students (last_name);
+        CREATE INDEX IF NOT EXISTS students_alias ON students (alias);
+        CREATE INDEX IF NOT EXISTS students_mobile ON students (mobile);
+    '''),
+    # people rowid is "<table rowid> * 3 + <kind>": 0 - student, 1 - teacher, 2 - alias.
+    (3, 'people full-text search index', '''
+        CREATE VIRTUAL TABLE IF NOT EXISTS people USING fts5 (
+            kind UNINDEXED, ref UNINDEXED, body,
+            tokenize = 'unicode61 remove_diacritics 0', prefix = '2 3');
+        CREATE TRIGGER IF NOT EXISTS people_students_insert AFTER INSERT ON students BEGIN
+            INSERT INTO people (rowid, kind, ref, body) VALUES (new.rowid * 3, 'student', new.rowid,
+                ifnull(new.last_name, '') || ' ' || ifnull(new.first_name, '') || ' ' || ifnull(new.second_name, '')
+                || ' ' || ifnull(new.alias, '') || ' ' || ifnull(new.mobile, ''));
+        END;
+        CREATE TRIGGER IF NOT EXISTS people_students_delete AFTER DELETE ON students BEGIN
+            DELETE FROM people WHERE rowid = old.rowid * 3;
+        END;
+        CREATE TRIGGER IF NOT EXISTS people_students_update AFTER UPDATE ON students BEGIN
+            DELETE FROM people WHERE rowid = old.rowid * 3;
+            INSERT INTO people (rowid, kind, ref, body) VALUES (new.rowid * 3, 'student', new.rowid,
+                ifnull(new.last_name, '') || ' ' || ifnull(new.first_name, '') || ' ' || ifnull(new.second_name, '')
+                || ' ' || ifnull(new.alias, '') || ' ' || ifnull(new.mobile, ''));
+        END;
+        CREATE TRIGGER IF NOT EXISTS people_teachers_insert AFTER INSERT ON teachers BEGIN
+            INSERT INTO people (rowid, kind, ref, body) VALUES (new.rowid * 3 + 1, 'teacher', new.rowid,
+                ifnull(new.last_name, '') || ' ' || ifnull(new.first_name, '') || ' ' || ifnull(new.second_name, '')
+                || ' ' || ifnull(new.lesson_name, '') || ' ' || ifnull(new.op, ''));
+        END;
+        CREATE TRIGGER IF NOT EXISTS people_teachers_delete AFTER DELETE ON teachers BEGIN
+            DELETE FROM people WHERE rowid = old.rowid * 3 + 1;
+        END;
+        CREATE TRIGGER IF NOT EXISTS people_teachers_update AFTER UPDATE ON teachers BEGIN
+            DELETE FROM people WHERE rowid = old.rowid * 3 + 1;
+            INSERT INTO people (rowid, kind, ref, body) VALUES (new.rowid * 3 + 1, 'teacher', new.rowid,
+                ifnull(new.last_name, '') || ' ' || ifnull(new.first_name, '') || ' ' || ifnull(new.second_name, '')
+                || ' ' || ifnull(new.lesson_name, '') || ' ' || ifnull(new.op, ''));
+        END;
+        CREATE TRIGGER IF NOT EXISTS people_aliases_insert AFTER INSERT ON aliases BEGIN
+            INSERT INTO people (rowid, kind, ref, body) VALUES (new.rowid * 3 + 2, 'alias', new.rowid,
+                ifnull(new.alias, '') || ' ' || ifnull(new.lesson_name, ''));
+        END;
+        CREATE TRIGGER IF NOT EXISTS people_aliases_delete AFTER DELETE ON aliases BEGIN
+            DELETE FROM people WHERE rowid = old.rowid * 3 + 2;
+        END;
+        CREATE TRIGGER IF NOT EXISTS people_aliases_update AFTER UPDATE ON aliases BEGIN
+            DELETE FROM people WHERE rowid = old.rowid * 3 + 2;
+            INSERT INTO people (rowid, kind, ref, body) VALUES (new.rowid * 3 + 2, 'alias', new.rowid,
+                ifnull(new.alias, '') || ' ' || ifnull(new.lesson_name, ''));
+        END;
+        DELETE FROM people;
+        INSERT INTO people (rowid, kind, ref, body) SELECT rowid * 3, 'student', rowid,
+            ifnull(last_name, '') || ' ' || ifnull(first_name, '') || ' ' || ifnull(second_name, '')
+            || ' ' || ifnull(alias, '') || ' ' || ifnull(mobile, '') FROM students;
+        INSERT INTO people (rowid, kind, ref, body) SELECT rowid * 3 + 1, 'teacher', rowid,
+            ifnull(last_name, '') || ' ' || ifnull(first_name, '') || ' ' || ifnull(second_name, '')
+            || ' ' || ifnull(lesson_name, '') || ' ' || ifnull(op, '') FROM teachers;
+        INSERT INTO people (rowid, kind, ref, body) SELECT rowid * 3 + 2, 'alias', rowid,
+            ifnull(alias, '') || ' ' || ifnull(lesson_name, '') FROM aliases;
+    '''),
+    (4, 'people index lemmas', getPeopleLemmasScript()),
+    (5, 'notifications subscribers', '''
+        CREATE TABLE IF NOT EXISTS subscribers (
+            chat_id INTEGER PRIMARY KEY, mention TEXT, created_at TEXT DEFAULT CURRENT_TIMESTAMP);
+    '''),
+    (6, 'timer sent alerts log', '''
+        CREATE TABLE IF NOT EXISTS sent_alerts (
+            lesson_id INTEGER, kind TEXT, sent_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (lesson_id, kind)) WITHOUT ROWID;
+    '''),
+    (7, 'zamena pages telegram files', '''
+        CREATE TABLE IF NOT EXISTS zamena_pages (
+            pdf TEXT, page INTEGER, hash TEXT, PRIMARY KEY (pdf, page)) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS zamena_files (
+            hash TEXT PRIMARY KEY, file_id TEXT NOT NULL, created_at TEXT DEFAULT CURRENT_TIMESTAMP) WITHOUT ROWID;
+    '''),
+    (8, 'zamena last sent version per chat', '''
+        CREATE TABLE IF NOT EXISTS zamena_sent (
+            chat_id INTEGER PRIMARY KEY, pdf TEXT NOT NULL, sent_at TEXT DEFAULT CURRENT_TIMESTAMP);
+    '''),
+    (9, 'zamena parsed replacements', '''
+        CREATE TABLE IF NOT EXISTS zamena_records (
+            pdf TEXT PRIMARY KEY, records TEXT NOT NULL, created_at TEXT DEFAULT CURRENT_TIMESTAMP) WITHOUT ROWID;
+    '''),
+    # triggers leaves "lemmas" NULL, writer fills it (DB.fillPeopleLemmas), so writes never needs "lemmas" function.
+    (10, 'people lemmas filled by writer', getPeopleTriggersScript()),
+    # lessons rowids are reused after delete, so alerts log of deleted lesson must go with it.
+    (11, 'sent alerts cleanup on lesson delete', '''
+        DELETE FROM sent_alerts WHERE lesson_id NOT IN (SELECT _rowid_ FROM lessons);
+        CREATE TRIGGER IF NOT EXISTS sent_alerts_lessons_delete AFTER DELETE ON lessons BEGIN
+            DELETE FROM sent_alerts WHERE lesson_id = old._rowid_;
+        END;
+    '''),
+    # the only row (id 0) keeps time what timer was alive last, missed alerts are replayed after it only.
+    (12, 'timer alive time', '''
+        CREATE TABLE IF NOT EXISTS timer_alive (id INTEGER PRIMARY KEY CHECK (id = 0), alive_at REAL NOT NULL);
+    '''),
+)
+
+
+async def getSchemaVersion(db: aiosqlite.Connection) -> int:
+    '''getSchemaVersion: returns current DB schema version.
+
+    Args:
+        db (aiosqlite.Connection): DB connection.
+
+    Returns:
+        int: schema version, 0 if no migrations applied.
+    '''
+    await db.execute('CREATE TABLE IF NOT EXISTS schema_version ('
+                     'version INTEGER PRIMARY KEY, name TEXT, applied_at TEXT DEFAULT CURRENT_TIMESTAMP)')
+    await db.commit()
+    async with db.execute('SELECT max(version) FROM schema_version') as cur:
+        row = await cur.fetchone()
+    return row[0] or 0
+
+
+async def migrate(db: aiosqlite.Connection) -> int:
+    '''migrate: applies all not applied migrations, each in own transaction.
+
+    Args:
+        db (aiosqlite.Connection): DB connection.
+
+    Returns:
+        int: schema version after migrate.
+    '''
+    version = await getSchemaVersion(db)
+    for num, name, script in MIGRATIONS:
+        if num <= version:
+            continue
+        log.info(f'Applying migration #{str(num)}: {name}')
+        # executescript commits pending transaction itself, so BEGIN/COMMIT lives in script.
+        try:
+            await db.executescript(
+                f'BEGIN;\n{script}\n'
+                f'INSERT INTO schema_version (version, name) VALUES ({int(num)}, \'{name}\');\nCOMMIT;')
+        except Exception as e:
+            log.error(f'Migration #{str(num)} failed: {str(e)}')
+            await db.rollback()
+            raise
+        version = num
+    log.debug(f'migrate: schema version: {str(version)}')
+    return version
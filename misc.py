@@ -6,11 +6,16 @@
 import logging
 from os import environ
 
-from aiogram import Bot, Dispatcher
+from aiogram import Dispatcher
 from aiogram.contrib.fsm_storage.memory import MemoryStorage
 
 from config import Config
 from db import Database
+from httpclient import HttpClient
+from notify import Notifier
+from sender import SendQueue, QueuedBot
+from supervisor import TaskSupervisor
+from zamena import Zamena
 from utils import BotKeyboards, Timer
 
 if 'TT_ENVIRONMENT' in environ:
@@ -22,6 +27,13 @@ else:
     conf = Config(log_debug=True)
 db = Database(conf)
 log = logging.getLogger('TeachTime')
-bot = Dispatcher(Bot(conf.getTgToken(), parse_mode='HTML'), storage=MemoryStorage())
-timer = Timer(bot, conf, db)
+sender = SendQueue(conf)
+bot = Dispatcher(QueuedBot(sender, conf.getTgToken(), parse_mode='HTML'), storage=MemoryStorage())
+notifier = Notifier(bot, conf, db)
+timer = Timer(bot, conf, db, notifier)
 keys = BotKeyboards(timer)
+supervisor = TaskSupervisor(conf)
+http = HttpClient(conf)
+zamena = Zamena(conf, db, http)
+supervisor.register('timer', timer.main, timer.stop)
+supervisor.register('zamena', zamena.main, zamena.stop)
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+#
+#  TeachTime module "notify".
+#  Created by LulzLoL231 at 2026/10/18
+#
+import asyncio
+import logging
+import typing
+
+from aiogram import Dispatcher
+from aiogram.utils.exceptions import BotBlocked, ChatNotFound, UserDeactivated, TelegramAPIError
+
+from config import Config
+
+
+class Notifier:
+    '''Notifier: sends alerts to all subscribed chats.
+
+    Subscribers are loaded from DB once and kept in memory, alert is
+    fanned out with at most conf.NOTIFY_CONCURRENCY sends at once.
+    ADMIN_ID is always subscribed.
+
+    Args:
+        bot (Dispatcher): aiogram Dispatcher instance.
+        conf (Config): TeachTime config instance.
+        db (Database): TeachTime database instance.
+    '''
+    def __init__(self, bot: Dispatcher, conf: Config, db):
+        self.bot = bot
+        self.conf = conf
+        self.db = db
+        self.subscribers = {conf.ADMIN_ID}  # subscribed chat ids
+        self.concurrency = conf.NOTIFY_CONCURRENCY
+        self.log = logging.getLogger('TeachTime Notifier')
+
+    async def load(self) -> int:
+        '''load: loads subscribers from DB.
+
+        Returns:
+            int: subscribers count.
+        '''
+        self.subscribers = {self.conf.ADMIN_ID, *await self.db.getSubscribers()}
+        self.log.info(f'Loaded {str(len(self.subscribers))} subscribers.')
+        return len(self.subscribers)
+
+    async def subscribe(self, chat_id: int, mention: str = None) -> bool:
+        '''subscribe: subscribes chat to alerts.
+
+        Args:
+            chat_id (int): telegram chat id.
+            mention (str, optional): chat mention. Defaults to None.
+
+        Returns:
+            bool: True if chat was subscribed, False if it already subscribed.
+        '''
+        added = await self.db.addSubscriber(chat_id, mention)
+        self.subscribers.add(chat_id)
+        return added
+
+    async def unsubscribe(self, chat_id: int) -> bool:
+        '''unsubscribe: unsubscribes chat from alerts.
+
+        Args:
+            chat_id (int): telegram chat id.
+
+        Returns:
+            bool: True if chat was unsubscribed, False if it was not subscribed.
+        '''
+        removed = await self.db.removeSubscriber(chat_id)
+        if chat_id != self.conf.ADMIN_ID:
+            self.subscribers.discard(chat_id)
+        return removed
+
+    async def send(self, chat_id: int, text: str, **kwargs) -> bool:
+        '''send: sends message to chat, flood control is retried by send queue.
+        Chats what blocked bot or not exists are unsubscribed.
+
+        Args:
+            chat_id (int): telegram chat id.
+            text (str): message text.
+            **kwargs: send_message kwargs.
+
+        Returns:
+            bool: True if message was sent.
+        '''
+        try:
+            await self.bot.bot.send_message(chat_id, text, **kwargs)
+            return True
+        except (BotBlocked, ChatNotFound, UserDeactivated) as e:
+            self.log.info(f'send: {str(chat_id)} is unreachable ({str(e)}), unsubscribing.')
+            await self.unsubscribe(chat_id)
+            return False
+        except TelegramAPIError as e:
+            self.log.error(f'send: {str(chat_id)} failed: {str(e)}')
+            return False
+
+    async def broadcast(self, text: str, chats: typing.Optional[typing.Iterable[int]] = None, **kwargs) -> int:
+        '''broadcast: sends message to all subscribers with bounded concurrency.
+
+        Args:
+            text (str): message text.
+            chats (typing.Optional[typing.Iterable[int]], optional): chat ids. Defaults to all subscribers.
+            **kwargs: send_message kwargs.
+
+        Returns:
+            int: sent messages count.
+        '''
+        chats = list(self.subscribers if chats is None else chats)
+        sem = asyncio.Semaphore(self.concurrency)
+
+        async def send(chat_id: int) -> bool:
+            async with sem:
+                return await self.send(chat_id, text, **kwargs)
+
+        sent = sum(await asyncio.gather(*[send(i) for i in chats]))
+        self.log.debug(f'broadcast: sent {str(sent)} of {str(len(chats))}.')
+        return sent
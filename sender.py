@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+#
+#  TeachTime module "sender".
+#  Created by LulzLoL231 at 2026/10/18
+#
+import time
+import asyncio
+import logging
+import typing
+from collections import deque
+
+from aiogram import Bot
+from aiogram.utils.exceptions import RetryAfter
+
+from config import Config
+
+
+# chat methods what goes through send queue, other methods (getUpdates, answerCallbackQuery...) goes directly.
+QUEUED_METHODS = ('send', 'edit', 'copy', 'forward', 'delete')
+# edits what can be merged into one call, when both waits in queue.
+MERGED_EDITS = ('editMessageText', 'editMessageReplyMarkup')
+
+
+class TokenBucket:
+    '''TokenBucket: rate limiter, allows "burst" calls at once and "rate" calls per second after.
+
+    Args:
+        rate (float): tokens per second.
+        burst (int): bucket capacity.
+    '''
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def delay(self) -> float:
+        '''delay: takes token if available.
+
+        Returns:
+            float: 0 if token was taken, else seconds before next token.
+        '''
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0
+        return (1 - self.tokens) / self.rate
+
+    def full(self) -> bool:
+        '''full: checks what bucket is refilled, so it is same as new one.
+
+        Returns:
+            bool: True if bucket has "burst" tokens.
+        '''
+        return self.tokens + (time.monotonic() - self.updated) * self.rate >= self.burst
+
+    async def acquire(self) -> None:
+        '''acquire: waits for token.
+        '''
+        while True:
+            delay = self.delay()
+            if not delay:
+                return
+            await asyncio.sleep(delay)
+
+
+class SendOp:
+    '''SendOp: queued Bot API call.'''
+    __slots__ = ('method', 'data', 'files', 'request', 'futures', 'enqueued')
+
+    def __init__(self, method: str, data: dict, files: typing.Optional[dict], request: typing.Callable):
+        self.method = method
+        self.data = data
+        self.files = files
+        self.request = request  # coroutine function (method, data, files) -> result
+        self.futures = [asyncio.get_event_loop().create_future()]
+        self.enqueued = time.monotonic()
+
+    def merge(self, op: 'SendOp') -> bool:
+        '''merge: merges later edit of same message into this op.
+
+        Args:
+            op (SendOp): later op.
+
+        Returns:
+            bool: True if merged.
+        '''
+        if self.method not in MERGED_EDITS or op.method not in MERGED_EDITS or self.files or op.files:
+            return False
+        if self.data.get('message_id') is None or self.data.get('message_id') != op.data.get('message_id'):
+            return False
+        if self.method == 'editMessageText' and op.method == 'editMessageReplyMarkup':
+            # text stays, markup replaced.
+            data = {k: v for k, v in self.data.items() if k != 'reply_markup'}
+            if op.data.get('reply_markup') is not None:
+                data['reply_markup'] = op.data['reply_markup']
+            self.data = data
+        else:
+            # later text edit without markup removes inline keyboard too, so later call wins.
+            self.method, self.data = op.method, op.data
+        self.futures.extend(op.futures)
+        return True
+
+
+class SendQueue:
+    '''SendQueue: outbound Bot API calls queue.
+
+    Calls are queued per chat and sent by one worker per chat, in order,
+    within per-chat and global rate limits. Consecutive edits of the same
+    message what waits in queue are merged into one call. Flood control
+    errors are retried after "retry_after". State of idle chats is dropped.
+
+    Args:
+        conf (Config): TeachTime config instance.
+    '''
+    def __init__(self, conf: Config):
+        self.chat_rate = conf.SEND_CHAT_RATE
+        self.chat_burst = conf.SEND_CHAT_BURST
+        self.retries = conf.SEND_RETRIES
+        self.bucket = TokenBucket(conf.SEND_GLOBAL_RATE, conf.SEND_GLOBAL_RATE)
+        self.chats = {}  # chat id -> pending ops deque
+        self.buckets = {}  # chat id -> TokenBucket
+        self.workers = {}  # chat id -> worker task
+        self.latencies = deque(maxlen=100)  # last sent ops latency, seconds
+        self.counters = {'sent': 0, 'merged': 0, 'retried': 0, 'failed': 0}
+        self.log = logging.getLogger('TeachTime SendQueue')
+
+    async def call(self, chat_id: typing.Union[int, str], method: str, data: dict,
+                   files: typing.Optional[dict], request: typing.Callable) -> typing.Any:
+        '''call: queues Bot API call and waits for result.
+
+        Args:
+            chat_id (typing.Union[int, str]): target chat.
+            method (str): Bot API method.
+            data (dict): request payload.
+            files (typing.Optional[dict]): request files.
+            request (typing.Callable): coroutine function (method, data, files) what makes request.
+
+        Returns:
+            typing.Any: Bot API result.
+        '''
+        op = SendOp(method, data, files, request)
+        fut = op.futures[0]
+        ops = self.chats.setdefault(chat_id, deque())
+        if ops and ops[-1].merge(op):
+            self.counters['merged'] += 1
+        else:
+            ops.append(op)
+        if chat_id not in self.workers:
+            self.workers[chat_id] = asyncio.ensure_future(self.worker(chat_id))
+        return await fut
+
+    async def worker(self, chat_id: typing.Union[int, str]) -> None:
+        '''worker: sends chat ops in order until chat queue is empty.
+
+        Args:
+            chat_id (typing.Union[int, str]): chat id.
+        '''
+        ops = self.chats[chat_id]
+        bucket = self.buckets.setdefault(chat_id, TokenBucket(self.chat_rate, self.chat_burst))
+        try:
+            while ops:
+                # op stays in queue while waiting for rate limit, so later edits can merge into it.
+                await bucket.acquire()
+                await self.bucket.acquire()
+                op = ops.popleft()
+                await self.send(op)
+        finally:
+            del self.workers[chat_id]
+            if not ops:
+                del self.chats[chat_id]
+            else:  # worker was cancelled, pending ops must not hang.
+                for op in ops:
+                    for fut in op.futures:
+                        fut.cancel()
+                ops.clear()
+                del self.chats[chat_id]
+            # limiters of idle chats are dropped once refilled, so chats state never grows with chats count.
+            for chat in [i for i, b in self.buckets.items() if i not in self.workers and b.full()]:
+                del self.buckets[chat]
+
+    async def send(self, op: SendOp) -> None:
+        '''send: makes op request, retries on flood control, sets op futures.
+
+        Args:
+            op (SendOp): op.
+        '''
+        attempt = 0
+        while True:
+            try:
+                result = await op.request(op.method, op.data, op.files)
+            except RetryAfter as e:
+                attempt += 1
+                if attempt > self.retries or op.files:
+                    self.setResult(op, error=e)
+                    return
+                self.counters['retried'] += 1
+                self.log.warning(f'send: {op.method} flood control, retry after {str(e.timeout)} sec.')
+                await asyncio.sleep(e.timeout)
+            except Exception as e:
+                self.setResult(op, error=e)
+                return
+            else:
+                self.setResult(op, result)
+                return
+
+    def setResult(self, op: SendOp, result: typing.Any = None, error: typing.Optional[Exception] = None) -> None:
+        '''setResult: sets op futures result or error, updates metrics.
+
+        Args:
+            op (SendOp): op.
+            result (typing.Any, optional): request result. Defaults to None.
+            error (typing.Optional[Exception], optional): request error. Defaults to None.
+        '''
+        self.latencies.append(time.monotonic() - op.enqueued)
+        self.counters['failed' if error else 'sent'] += 1
+        for fut in op.futures:
+            if fut.done():
+                continue
+            if error:
+                fut.set_exception(error)
+            else:
+                fut.set_result(result)
+
+    async def drain(self, timeout: float) -> bool:
+        '''drain: waits until all queued calls are sent.
+
+        Args:
+            timeout (float): max seconds to wait.
+
+        Returns:
+            bool: True if queue is empty.
+        '''
+        if self.workers:
+            await asyncio.wait(set(self.workers.values()), timeout=timeout)
+        return not self.workers
+
+    def stats(self) -> dict:
+        '''stats: returns queue metrics.
+
+        Returns:
+            dict: queue depth, busy chats, counters and send latency (ms) of last ops.
+        '''
+        latencies = sorted(self.latencies)
+        return {
+            'depth': sum(len(i) for i in self.chats.values()),
+            'chats': len(self.workers),
+            **self.counters,
+            'latency_avg': round(sum(latencies) / len(latencies) * 1000, 1) if latencies else 0,
+            'latency_p95': round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 1) if latencies else 0,
+            'latency_max': round(latencies[-1] * 1000, 1) if latencies else 0,
+        }
+
+
+class QueuedBot(Bot):
+    '''QueuedBot: aiogram Bot what sends chat methods through SendQueue.
+
+    Args:
+        queue (SendQueue): TeachTime send queue instance.
+        *args, **kwargs: aiogram Bot args.
+    '''
+    def __init__(self, queue: SendQueue, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.queue = queue
+
+    async def request(self, method: str, data: typing.Optional[dict] = None,
+                      files: typing.Optional[dict] = None, **kwargs) -> typing.Any:
+        if data and data.get('chat_id') is not None and method.startswith(QUEUED_METHODS):
+            return await self.queue.call(
+                data['chat_id'], method, data, files,
+                lambda m, d, f: super(QueuedBot, self).request(m, d, f, **kwargs))
+        return await super().request(method, data, files, **kwargs)
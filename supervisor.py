@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+#
+#  TeachTime module "supervisor".
+#  Created by LulzLoL231 at 2026/10/18
+#
+import time
+import asyncio
+import logging
+import typing
+
+from config import Config
+
+
+class TaskSupervisor:
+    '''TaskSupervisor: runs named background tasks, one task per name.
+
+    Crashed task is restarted with exponential backoff, task what returns
+    normally is considered stopped.
+
+    Args:
+        conf (Config): TeachTime config instance.
+    '''
+    def __init__(self, conf: Config):
+        self.backoff = conf.TASK_BACKOFF
+        self.backoff_max = conf.TASK_BACKOFF_MAX
+        self.stop_timeout = conf.TASK_STOP_TIMEOUT
+        self.specs = {}  # name -> (coroutine function, stop function or None)
+        self.tasks = {}  # name -> running asyncio.Task
+        self.states = {}  # name -> state dict: state, started, restarts, error
+        self.log = logging.getLogger('TeachTime TaskSupervisor')
+
+    def register(self, name: str, func: typing.Callable[[], typing.Awaitable],
+                 stop: typing.Optional[typing.Callable[[], None]] = None) -> None:
+        '''register: registers task.
+
+        Args:
+            name (str): task name.
+            func (typing.Callable[[], typing.Awaitable]): coroutine function, task body.
+            stop (typing.Optional[typing.Callable[[], None]], optional): asks task body to return. Defaults to None (task is cancelled).
+        '''
+        self.specs[name] = (func, stop)
+        self.states[name] = {'state': 'stopped', 'started': None, 'restarts': 0, 'error': None}
+
+    def isRunning(self, name: str) -> bool:
+        '''isRunning: checks if task is running (or waits for restart).
+
+        Args:
+            name (str): task name.
+
+        Returns:
+            bool: True if running.
+        '''
+        return name in self.tasks
+
+    def start(self, name: str) -> bool:
+        '''start: starts task, if not running.
+
+        Args:
+            name (str): task name.
+
+        Returns:
+            bool: True if task was started, False if it already running.
+        '''
+        if name in self.tasks:
+            return False
+        self.log.info(f'Starting task "{name}".')
+        task = asyncio.ensure_future(self.run(name))
+        self.tasks[name] = task
+        task.add_done_callback(lambda _: self.tasks.pop(name, None))
+        return True
+
+    async def stop(self, name: str) -> bool:
+        '''stop: stops task and waits for it.
+        Task stop function is called first, task is cancelled if it not returned in TASK_STOP_TIMEOUT.
+
+        Args:
+            name (str): task name.
+
+        Returns:
+            bool: True if task was stopped, False if it not running.
+        '''
+        task = self.tasks.get(name)
+        if task is None:
+            return False
+        self.log.info(f'Stopping task "{name}".')
+        stop = self.specs[name][1]
+        if stop and self.states[name]['state'] == 'running':
+            stop()
+            await asyncio.wait({task}, timeout=self.stop_timeout)
+        if not task.done():
+            task.cancel()
+            await asyncio.wait({task})
+        return True
+
+    async def stopAll(self) -> None:
+        '''stopAll: stops all running tasks.
+        '''
+        await asyncio.gather(*[self.stop(i) for i in list(self.tasks)])
+
+    async def run(self, name: str) -> None:
+        '''run: runs task body, restarts it with backoff on crash.
+
+        Args:
+            name (str): task name.
+        '''
+        func = self.specs[name][0]
+        state = self.states[name]
+        backoff = self.backoff
+        try:
+            while True:
+                state['state'] = 'running'
+                state['started'] = time.time()
+                try:
+                    await func()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    state['error'] = f'{type(e).__name__}: {str(e)}'
+                    state['restarts'] += 1
+                    # task what worked long enough is restarted fast again.
+                    if time.time() - state['started'] > self.backoff_max:
+                        backoff = self.backoff
+                    self.log.exception(f'Task "{name}" crashed, restart in {str(backoff)} sec.')
+                    state['state'] = 'backoff'
+                    await asyncio.sleep(backoff)
+                    backoff = min(backoff * 2, self.backoff_max)
+                else:
+                    self.log.info(f'Task "{name}" is done.')
+                    return
+        finally:
+            state['state'] = 'stopped'
+
+    def stats(self) -> dict:
+        '''stats: returns tasks states.
+
+        Returns:
+            dict: task name -> state dict (state, started, restarts, error).
+        '''
+        return {name: dict(state) for name, state in self.states.items()}
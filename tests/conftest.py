@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+#
+#  TeachTime tests fixtures.
+#  Created by LulzLoL231 at 2026/10/18
+#
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config  # noqa: E402
+
+
+@pytest.fixture
+def conf(tmp_path) -> Config:
+    '''conf: returns config with DB in temporary directory.
+    '''
+    conf = Config()
+    conf.db_name = str(tmp_path / 'teachtime.db')
+    return conf
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+#
+#  TeachTime tests of module "db".
+#  Created by LulzLoL231 at 2026/10/18
+#
+import asyncio
+
+import utils
+from db import Database
+
+
+def run(conf, test) -> None:
+    '''run: runs test coroutine function with connected database.
+    '''
+    async def main():
+        db = Database(conf)
+        await db.connect()
+        try:
+            await test(db)
+        finally:
+            await db.close()
+    asyncio.run(main())
+
+
+def test_zamena_cancels_all_lessons(conf):
+    date = '2026-10-19'
+
+    async def test(db: Database):
+        await db.setLessonsTypesTimes(date)
+        await db.addLessons([{'name': 'Математика', 'type': 1, 'date': date}])
+        assert len(await db.getDay(date)) == 1
+        records = [{'date': date, 'type': 1, 'name': None, 'teacher': None, 'room': None}]
+        lessons = utils.getZamenaLessons(await db.getDefaultLessonsByDate(date), records,
+                                         await db.getTypesTimesByDate(date), date)
+        assert lessons == []
+        assert await db.addLessons(lessons, replace=True, dates=[date]) is True
+        assert await db.getDay(date) == []
+
+    run(conf, test)
+
+
+def test_query_plans(conf):
+    async def test(db: Database):
+        assert await db.checkQueryPlans(db.writer_conn) == len(Database.INDEXED_QUERIES)
+
+    run(conf, test)
+
+
+def test_close_after_writer_crash(conf):
+    async def crash():
+        raise RuntimeError('writer crashed')
+
+    async def test(db: Database):
+        db.writer.cancel()
+        db.writer = asyncio.ensure_future(crash())
+        await asyncio.sleep(0)
+
+    run(conf, test)
@@ -3,19 +3,26 @@
 #  TeachTime module "utilites".
 #  Created by LulzLoL231 at 09/09/20
 #
+import re
+import typing
+import time
+import heapq
+import asyncio
 import locale
+import functools
 import datetime
 import logging
 import hmac
 import hashlib
 from sys import platform
-from asyncio import sleep
 from logging import getLogger
 
 from aiogram import types, Dispatcher
+from aiogram.utils.markdown import quote_html
 from pymorphy2 import MorphAnalyzer
 
 from config import Config
+from events import LessonsChanged, TimetableChanged, CurrentLessonChanged
 
 
 log = logging.getLogger('TeachTime Utilites')
@@ -23,6 +30,85 @@ if platform == 'linux':
     locale.setlocale(locale.LC_ALL, 'ru_RU.UTF-8')
 else:
     locale.setlocale(locale.LC_ALL, 'ru')
+morph = None  # pymorphy2 analyzer, created by getMorph on first use.
+AGREE_WORDS = ('час', 'минута', 'секунда')  # words agreed with numbers by getLessonEt
+agree_table = None  # {word: [agreed word for 0-59]}, built by getAgreeTable on first use.
+
+
+def getMorph() -> MorphAnalyzer:
+    '''getMorph: returns process-wide pymorphy2 analyzer, loads dictionaries on first call.
+
+    Returns:
+        MorphAnalyzer: pymorphy2 analyzer.
+    '''
+    global morph
+    if morph is None:
+        morph = MorphAnalyzer()
+    return morph
+
+
+def getLemmas(text: str) -> str:
+    '''getLemmas: returns normal forms of all words in text, every possible form for ambiguous word.
+
+    Args:
+        text (str): some text.
+
+    Returns:
+        str: lowercase normal forms separated by space, empty if analyzer failed.
+    '''
+    if not text:
+        return ''
+    lemmas = []
+    try:
+        for word in re.findall(r'\w+', text.lower()):
+            for parse in getMorph().parse(word):
+                if parse.normal_form not in lemmas:
+                    lemmas.append(parse.normal_form)
+    except Exception as e:
+        log.error(f'getLemmas: analyzer failed: {str(e)}')
+        return ''
+    return ' '.join(lemmas)
+
+
+@functools.lru_cache(maxsize=4096)
+def inflectWord(word: str, grammemes: frozenset) -> str:
+    '''inflectWord: returns word inflected to grammemes, results are memorized.
+
+    Args:
+        word (str): some word.
+        grammemes (frozenset): pymorphy2 grammemes, like frozenset({'gent'}).
+
+    Returns:
+        str: inflected word, or word itself if it can't be inflected.
+    '''
+    inflected = getMorph().parse(word)[0].inflect(set(grammemes))
+    return inflected.word if inflected else word
+
+
+@functools.lru_cache(maxsize=4096)
+def agreeWord(word: str, num: int) -> str:
+    '''agreeWord: returns word agreed with number, results are memorized.
+
+    Args:
+        word (str): base word.
+        num (int): number.
+
+    Returns:
+        str: agreed word.
+    '''
+    return getMorph().parse(word)[0].make_agree_with_number(num).word
+
+
+def getAgreeTable() -> dict:
+    '''getAgreeTable: returns agreement table of AGREE_WORDS for numbers 0-59, builds it on first call.
+
+    Returns:
+        dict: {word: [agreed word for 0-59]}
+    '''
+    global agree_table
+    if agree_table is None:
+        agree_table = {word: [agreeWord(word, num) for num in range(60)] for word in AGREE_WORDS}
+    return agree_table
 
 
 def getGentLessonName(name: str) -> str:
@@ -34,7 +120,7 @@ def getGentLessonName(name: str) -> str:
     Returns:
         str: lesson name in gent lexema.
     '''
-    return ' '.join([MorphAnalyzer().parse(i)[0].inflect({'gent'}).word for i in name.split()]).strip().capitalize()
+    return ' '.join([inflectWord(i, frozenset({'gent'})) for i in name.split()]).strip().capitalize()
 
 
 def getAbltLexema(text: str) -> str:
@@ -46,7 +132,7 @@ def getAbltLexema(text: str) -> str:
     Returns:
         str: text in ablt lexema.
     '''
-    return ' '.join([MorphAnalyzer().parse(i)[0].inflect({'ablt'}).word for i in text.split()]).strip().capitalize()
+    return ' '.join([inflectWord(i, frozenset({'ablt'})) for i in text.split()]).strip().capitalize()
 
 
 def getNowDate() -> str:
@@ -220,6 +306,55 @@ def parseLessons(array: list, date: str) -> str:
     return cnt
 
 
+def parseZamenaRecords(records: list) -> str:
+    '''parseZamenaRecords: returns telegram message content with zamena replacements.
+
+    Args:
+        records (list): replacements records, like zamena.parseZamena.
+
+    Returns:
+        str: telegram message content.
+    '''
+    lines = []
+    date = None
+    for i in sorted(records, key=lambda i: (i['date'], i['type'])):
+        if i['date'] != date:
+            if date:
+                lines.append('')
+            date = i['date']
+            lines.append(f'<b>Замена на {getDateName(getDateObjFromStr(date))}</b>')
+        if i['name'] is None:
+            lines.append(f'<s>{str(i["type"])} пара</s> <i>снята</i>')
+        else:
+            info = ', '.join(quote_html(j) for j in (i['teacher'], i['room'] and f'ауд. {i["room"]}') if j)
+            lines.append(f'<b>{str(i["type"])} пара: {quote_html(i["name"])}</b>' + (f' ({info})' if info else ''))
+    return '\n'.join(lines)
+
+
+def getZamenaLessons(defaults: list, records: list, timetable: dict, date: str) -> list:
+    '''getZamenaLessons: returns lessons of date, default lessons with zamena replacements applied.
+
+    Args:
+        defaults (list): default lessons of date.
+        records (list): replacements records, like zamena.parseZamena.
+        timetable (dict): lesson types times of date, pairs without times are skipped.
+        date (str): lessons date.
+
+    Returns:
+        list: lessons array for Database.addLessons.
+    '''
+    lessons = {i['type']: {'name': i['name'], 'type': i['type'], 'date': date, 'info': None} for i in defaults}
+    for i in records:
+        if i['date'] != date or f'start{str(i["type"])}' not in timetable:
+            continue
+        if i['name'] is None:
+            lessons.pop(i['type'], None)
+        else:
+            info = ', '.join(j for j in (i['teacher'], i['room'] and f'ауд. {i["room"]}') if j)
+            lessons[i['type']] = {'name': i['name'], 'type': i['type'], 'date': date, 'info': info or None}
+    return [lessons[i] for i in sorted(lessons)]
+
+
 def getVKProfileURI(vk_id: str) -> str:
     '''getVKProfileURI: returns VK profile URI like "https://vk.com/id<ID>"
 
@@ -580,6 +715,22 @@ def getSendZamenaImagesKey() -> types.InlineKeyboardMarkup:
     key.add(btn_yes, btn_no)
     return key
 
+def getZamenaApplyKey(dates: typing.Iterable[str]) -> types.InlineKeyboardMarkup:
+    '''getZamenaApplyKey: returns inline keyboard what applies zamena replacements to lessons.
+
+    Args:
+        dates (typing.Iterable[str]): replacements dates.
+
+    Returns:
+        types.InlineKeyboardMarkup: telegram inline keyboard.
+    '''
+    key = types.InlineKeyboardMarkup()
+    for date in sorted(set(dates)):
+        key.add(types.InlineKeyboardButton(
+            f'Установить пары на {getDateObjFromStr(date).strftime("%d.%m")}', callback_data=f'zamenaApply:{date}'))
+    return key
+
+
 def getEnchKey() -> types.InlineKeyboardMarkup:
     '''getEnchKey: returns enhancement's inline keyboard.
 
@@ -807,7 +958,9 @@ def getWordAgreeNum(word: str, num: int) -> str:
     Returns:
         str: agreed word.
     '''
-    return MorphAnalyzer().parse(word)[0].make_agree_with_number(num).word
+    if 0 <= num < 60 and word in AGREE_WORDS:
+        return getAgreeTable()[word][num]
+    return agreeWord(word, num)
 
 
 def getLessonEt(start_time: datetime.datetime = None, td: datetime.timedelta = None) -> str:
@@ -891,6 +1044,7 @@ class BotKeyboards:
         self.log = getLogger('TeachTime BotKeyboards')
         self.timer = timer
         self.current_lesson = None
+        self.tracking = False  # current lesson tracking is enabled
 
     def set_lesson(self, lesson) -> bool:
         '''set_lesson: asign provided lesson as self.current_lesson
@@ -918,16 +1072,18 @@ class BotKeyboards:
             self.log.debug('get_lesson_name - Current Lesson: None')
             return 'Ничего'
 
-    async def loop(self):
-        '''loop: class main loop.
+    def track(self) -> bool:
+        '''track: enables current lesson tracking, by timer events.
+
+        Returns:
+            bool: True if tracking was enabled, False if it already enabled.
         '''
-        while True:
-            await sleep(10)
-            self.log.debug(f'loop - timer.work: {str(self.timer.work)}, timer.lesson: {str(self.timer.lesson)}')
-            if self.timer.work:
-                self.set_lesson(self.timer.lesson)
-            else:
-                self.set_lesson(None)
+        if self.tracking:
+            return False
+        self.tracking = True
+        self.timer.events.subscribe(CurrentLessonChanged, lambda e: self.set_lesson(e.lesson))
+        self.set_lesson(self.timer.lesson if self.timer.work else None)
+        return True
 
     def getStartKey(self) -> types.ReplyKeyboardMarkup:
         '''getStartKey returns telegram reply keyboard with start keys.
@@ -951,89 +1107,232 @@ class Timer:
             bot (Dispatcher): aiogram Dispatcher instance.
             conf (Config): TeachTime config instance.
             db (Database): TeachTime database instance.
+            notifier (Notifier): TeachTime notifier instance, alerts are sent to its subscribers.
     '''
 
-    def __init__(self, bot: Dispatcher, conf: Config, db):
-        self.WAIT_GET_LESSONS = 10  # every 10 sec.
+    def __init__(self, bot: Dispatcher, conf: Config, db, notifier):
         self.FIRST_LESSON_ALERT = 600  # notify 10 minutes before the start
         self.SECOND_LESSON_ALERT = 120  # notify 2 minutes before the start
-        self.lessons = None  # lessons array in current loop
-        self.lesson = None  # lesson dict from lessons array
+        self.ALERT_GRACE = 60  # not sent alert overdue up to 1 minute on schedule rebuild is sent at once
+        self.HEARTBEAT = 60  # store alive time at least every minute, missed alerts are replayed after it
+        self.lessons = None  # lessons array in current schedule
+        self.lesson = None  # lesson dict of next alert
         self.past_lesson = None  # passed lesson dict
         self.work = False  # timer is working
+        self.alerts = []  # min-heap of (deadline timestamp, seq, alert kind, lesson dict)
+        self.wakeup = None  # asyncio.Event, set at deadline, on lessons change or stop
+        self.changed = False  # today lessons changed, schedule must be rebuilt
         self.bot = bot
         self.conf = conf
         self.db = db
+        self.notifier = notifier
+        self.events = db.events
         self.log = getLogger('TeachTime Timer')
+        self.events.subscribe(LessonsChanged, lambda e: self.reschedule(e.date))
+        self.events.subscribe(TimetableChanged, lambda e: self.reschedule(e.date))
+
+    def setLesson(self, lesson: typing.Optional[dict]) -> None:
+        '''setLesson: sets lesson of next alert, publishes CurrentLessonChanged if it changed.
+
+        Args:
+            lesson (typing.Optional[dict]): lesson dict or None.
+        '''
+        if lesson != self.lesson:
+            self.lesson = lesson
+            self.events.publish(CurrentLessonChanged(lesson))
+
+    def getLessonTimes(self, lesson: dict) -> typing.Optional[tuple]:
+        '''getLessonTimes: returns lesson start and end timestamps.
+
+        Args:
+            lesson (dict): lesson dict.
+
+        Returns:
+            typing.Optional[tuple]: (start, end) timestamps, or None if lesson times are not set.
+        '''
+        if not lesson['from'] or not lesson['to']:
+            return None
+        return (getDateObjFromStr(lesson['date'] + ' ' + lesson['from']).timestamp(),
+                getDateObjFromStr(lesson['date'] + ' ' + lesson['to']).timestamp())
+
+    def schedule(self, lessons: list, sent: set = frozenset()) -> None:
+        '''schedule: builds alerts heap for provided lessons, alerts already sent, of visited lessons
+        and overdue more than ALERT_GRACE are skipped.
+
+        Args:
+            lessons (list): lessons array.
+            sent (set, optional): already sent (lesson id, alert kind) tuples. Defaults to empty.
+        '''
+        self.lessons = lessons
+        self.alerts = []
+        now = time.time()
+        for lesson in lessons:
+            times = self.getLessonTimes(lesson)
+            if times is None or lesson['visit']:
+                continue
+            start, end = times
+            for deadline, kind in ((start - self.FIRST_LESSON_ALERT, 'first'), (start - self.SECOND_LESSON_ALERT, 'second'),
+                                   (start, 'start'), (end, 'end')):
+                if deadline > now - self.ALERT_GRACE and (lesson['id'], kind) not in sent:
+                    self.alerts.append((deadline, len(self.alerts), kind, lesson))
+        heapq.heapify(self.alerts)
+        self.log.info(f'Scheduled {str(len(self.alerts))} alerts for {str(len(lessons))} lessons.')
+
+    def getMissedAlerts(self, lessons: list, sent: set, since: float) -> list:
+        '''getMissedAlerts: returns alerts what was due while timer was not working, not sent, and still actual:
+        "end" (visit prompt) of ended not visited lessons and "start" of lessons going now.
+
+        Args:
+            lessons (list): lessons array.
+            sent (set): already sent (lesson id, alert kind) tuples.
+            since (float): timestamp what timer was alive last.
+
+        Returns:
+            list: (alert kind, lesson dict) tuples.
+        '''
+        missed = []
+        now = time.time()
+        for lesson in lessons:
+            times = self.getLessonTimes(lesson)
+            if times is None or lesson['visit']:
+                continue
+            start, end = times
+            if since <= end <= now and (lesson['id'], 'end') not in sent:
+                missed.append(('end', lesson))
+            elif since <= start <= now < end and (lesson['id'], 'start') not in sent:
+                missed.append(('start', lesson))
+        return missed
+
+    async def beat(self) -> None:
+        '''beat: stores time what timer was alive, not later than next alert deadline, so it is never skipped by recover.
+        '''
+        alive = time.time()
+        if self.alerts:
+            alive = min(alive, self.alerts[0][0])
+        await self.db.setTimerAlive(alive)
+
+    async def recover(self) -> int:
+        '''recover: sends alerts missed while timer was not working, for yesterday and today lessons.
+        Nothing is sent if timer never worked with this DB, so unknown downtime never floods alerts.
+
+        Returns:
+            int: sent alerts count.
+        '''
+        since = await self.db.getTimerAlive()
+        if since is None:
+            self.log.info('recover: timer was never alive, nothing to recover.')
+            return 0
+        lessons = await self.db.getDay(getNextDate(-1)) + await self.db.getDay(getNowDate())
+        missed = self.getMissedAlerts(lessons, await self.db.getSentAlerts(i['id'] for i in lessons), since)
+        if missed:
+            self.log.info(f'Recovering {str(len(missed))} missed alerts.')
+            await asyncio.gather(*[self.alert(kind, lesson, record=False) for kind, lesson in missed])
+            await self.db.addSentAlerts((lesson['id'], kind) for kind, lesson in missed)
+        return len(missed)
+
+    def reschedule(self, date: typing.Optional[str] = None) -> None:
+        '''reschedule: signal what lessons are changed, timer rebuilds schedule if date is today.
+
+        Args:
+            date (typing.Optional[str], optional): changed lessons date. Defaults to None (any date).
+        '''
+        if date is None or date == getNowDate():
+            self.log.debug(f'reschedule: lessons changed for {str(date)}')
+            self.changed = True
+            if self.wakeup:
+                self.wakeup.set()
+
+    def stop(self) -> None:
+        '''stop: stops timer immediately.
+        '''
+        self.work = False
+        if self.wakeup:
+            self.wakeup.set()
+
+    async def sleepUntil(self, deadline: float) -> None:
+        '''sleepUntil: sleeps until deadline, or until woken by reschedule/stop.
+
+        Args:
+            deadline (float): deadline timestamp.
+        '''
+        loop = asyncio.get_event_loop()
+        self.wakeup.clear()
+        handle = loop.call_at(loop.time() + max(deadline - time.time(), 0), self.wakeup.set)
+        try:
+            await self.wakeup.wait()
+        finally:
+            handle.cancel()
 
     async def main(self):
+        '''main: timer loop, returns after stop. Runs as supervised "timer" task.
+        '''
         self.log.info('Timer is started up.')
         self.work = True
-        while True and self.work:
-            temp = await self.db.getLessonsByDate(getNowDate())
-            self.log.debug(f'Timer loop! Temp: {str(temp)}')
-            if temp:
-                self.lessons = getSortedLessons(getNotPassedLessons(temp))
-                if self.lessons and self.work:
-                    self.log.info('Recived new lessons.')
-                    self.log.debug(f'lessons: {str(self.lessons)}')
-                    for lesson in self.lessons:
-                        if self.work is False:
-                            continue
-                        if self.past_lesson:
-                            lesson_info = await self.signLessonInfo(self.past_lesson)
-                            await self.bot.bot.send_message(self.conf.ADMIN_ID,
-                                                            f'{self.past_lesson["type"]} пара: '
-                                                            f'<b>{self.past_lesson["name"]}</b> - '
-                                                            '<i>закончилась!</i>',
-                                                            reply_markup=getLessonVisitInlineMarkup(lesson_info))
-                        self.lesson = lesson
-                        lesson_time = getDateObjFromStr(lesson['date'] + ' ' + lesson['from'])
-                        alert1 = ((lesson_time - datetime.timedelta(seconds=self.FIRST_LESSON_ALERT)) - datetime.datetime.now())
-                        self.log.info(f'Lesson #{str(lesson["type"])} {lesson["name"]}: '
-                                      f'Alert 1: {str(alert1.total_seconds())} sec')
-                        if alert1.total_seconds() > 0:
-                            if self.work:
-                                await self.bot.bot.send_message(self.conf.ADMIN_ID,
-                                                                f'{lesson["type"]} пара: '
-                                                                f'<b>{lesson["name"]}</b>, '
-                                                                f'начнётся <b>через {getLessonEt(lesson_time)}</b>')
-                                await self.wait(alert1.total_seconds())
-                        alert2 = ((lesson_time - datetime.timedelta(seconds=self.SECOND_LESSON_ALERT)) - datetime.datetime.now())
-                        self.log.info(f'Lesson #{str(lesson["type"])} {lesson["name"]}: '
-                                      f'Alert 2: {str(alert2.total_seconds())} sec')
-                        if alert2.total_seconds() > 0:
-                            if self.work:
-                                await self.bot.bot.send_message(self.conf.ADMIN_ID,
-                                                                f'{lesson["type"]} пара: '
-                                                                f'<b>{lesson["name"]}</b>, '
-                                                                f'начнётся <b>через {getLessonEt(lesson_time)}!</b>')
-                                await self.wait(alert2.total_seconds())
-                        lesson_end = (getDateObjFromStr(
-                            lesson['date'] + ' ' + lesson['to']) - datetime.datetime.now())
-                        if lesson_end.total_seconds() > 0 and self.work:
-                            await self.bot.bot.send_message(self.conf.ADMIN_ID,
-                                                            f'{lesson["type"]} пара: '
-                                                            f'<b>{lesson["name"]}</b>, '
-                                                            'началась, и закончится <b>через '
-                                                            f'{getLessonEt(td=lesson_end)}.</b>')
-                            await self.wait(lesson_end.total_seconds())
-                        if await self.lessonInTT(self.lesson):
-                            self.past_lesson = self.lesson
-            if self.past_lesson and self.work:
-                lesson_info = await self.signLessonInfo(self.past_lesson)
-                await self.bot.bot.send_message(self.conf.ADMIN_ID,
-                                                f'{self.past_lesson["type"]} пара: '
-                                                f'<b>{self.past_lesson["name"]}</b> - '
-                                                '<i>закончилась!</i>',
-                                                reply_markup=getLessonVisitInlineMarkup(lesson_info))
-                self.past_lesson = None
+        self.wakeup = asyncio.Event()
+        try:
+            await self.recover()
+            while self.work:
+                self.changed = False
+                lessons = await self.db.getDay(getNowDate())
+                self.schedule(lessons, await self.db.getSentAlerts(i['id'] for i in lessons))
+                while self.work and not self.changed:
+                    self.setLesson(self.alerts[0][3] if self.alerts else None)
+                    if self.alerts:
+                        deadline = self.alerts[0][0]
+                    else:  # nothing to alert today, rebuild schedule at midnight.
+                        deadline = getDateObjFromStr(getNextDate()).timestamp()
+                    await self.beat()
+                    await self.sleepUntil(min(deadline, time.time() + self.HEARTBEAT))
+                    if deadline > time.time() or not self.work or self.changed:
+                        continue
+                    if not self.alerts:
+                        break
+                    _, _, kind, lesson = heapq.heappop(self.alerts)
+                    await self.alert(kind, lesson)
+        finally:
+            try:
+                await self.beat()
+            except Exception as e:
+                self.log.error(f'main: alive time is not stored: {str(e)}')
+            self.work = False
+            self.alerts = []
             self.past_lesson = None
-            self.lesson = None
-            await sleep(self.WAIT_GET_LESSONS)
-            continue
-        self.past_lesson = None
-        self.lesson = None
+            self.setLesson(None)
+            self.log.info('Timer is stopped.')
+
+    async def alert(self, kind: str, lesson: dict, record: bool = True) -> None:
+        '''alert: sends lesson alert.
+
+        Args:
+            kind (str): alert kind ("first", "second", "start" or "end").
+            lesson (dict): lesson dict.
+            record (bool, optional): record alert as sent. Defaults to True.
+        '''
+        self.log.info(f'Lesson #{str(lesson["type"])} {lesson["name"]}: alert "{kind}".')
+        lesson_time = getDateObjFromStr(lesson['date'] + ' ' + lesson['from'])
+        if kind == 'first':
+            await self.notifier.broadcast(f'{lesson["type"]} пара: '
+                                          f'<b>{lesson["name"]}</b>, '
+                                          f'начнётся <b>через {getLessonEt(lesson_time)}</b>')
+        elif kind == 'second':
+            await self.notifier.broadcast(f'{lesson["type"]} пара: '
+                                          f'<b>{lesson["name"]}</b>, '
+                                          f'начнётся <b>через {getLessonEt(lesson_time)}!</b>')
+        elif kind == 'start':
+            lesson_end = getDateObjFromStr(lesson['date'] + ' ' + lesson['to']) - datetime.datetime.now()
+            await self.notifier.broadcast(f'{lesson["type"]} пара: '
+                                          f'<b>{lesson["name"]}</b>, '
+                                          'началась, и закончится <b>через '
+                                          f'{getLessonEt(td=lesson_end)}.</b>')
+        else:
+            self.past_lesson = lesson
+            text = f'{lesson["type"]} пара: <b>{lesson["name"]}</b> - <i>закончилась!</i>'
+            # visits are tracked for admin only, so visit prompt goes to admin.
+            lesson_info = await self.signLessonInfo(lesson)
+            await self.notifier.send(self.conf.ADMIN_ID, text, reply_markup=getLessonVisitInlineMarkup(lesson_info))
+            await self.notifier.broadcast(text, [i for i in self.notifier.subscribers if i != self.conf.ADMIN_ID])
+        if record:
+            await self.db.addSentAlerts(((lesson['id'], kind),))
 
     async def signLessonInfo(self, lesson: dict) -> str:
         '''encryptLessonInfo: returns signed lesson info.
@@ -1046,7 +1345,7 @@ class Timer:
         '''
         self.log.debug(f'signLessonInfo called with arg - lesson: {str(lesson)}')
         cnt = 'visit:{}'
-        lessonid = await self.db.getLessonID(lesson)
+        lessonid = lesson['id'] if 'id' in lesson else await self.db.getLessonID(lesson)
         cnt = cnt.format(str(lessonid))
         sign = hmac.new(self.conf.KEY, cnt.encode(), hashlib.md5).hexdigest()
         cnt = cnt + f':{sign}'
@@ -1073,48 +1372,6 @@ class Timer:
             self.log.debug('getLessonIDFromLessonInfo verify - Fail.')
             return None
 
-    async def lessonInTT(self, lesson: dict) -> bool:
-        '''lessonInTT: check if lesson in timetable.
-
-        Args:
-            lesson (dict): lesson dict.
-
-        Returns:
-            bool: True or False
-        '''
-        if self.work:
-            temp = await self.db.getLessonsByDate(lesson['date'])
-            lessons = getSortedLessons(temp)
-            return lesson in lessons
-
-    async def wait(self, delay: int) -> bool:
-        '''wait: coroutine that returns True, if is not interrupted, after a given time (in seconds).
-
-        Args:
-            delay (int): delay seconds.
-
-        Returns:
-            bool: True or False.
-        '''
-        self.log.debug(f'Timer for {str(delay)} seconds is started!')
-        start_time = datetime.datetime.now()
-        while True:
-            if self.work:
-                if await self.lessonInTT(self.lesson):
-                    if start_time >= (datetime.datetime.now() - datetime.timedelta(seconds=delay)):
-                        await sleep(10)
-                        continue
-                    else:
-                        self.log.debug('Timer is timed out!')
-                        break
-                else:
-                    self.log.debug('Timer has been interrupted because lesson not in timetable!')
-                    return False
-            else:
-                self.log.debug('Timer has been interrupted!')
-                return False
-        return True
-
     async def getCurrentLesson(self):
         return self.lesson
 
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+#
+#  TeachTime module "webhook".
+#  Created by LulzLoL231 at 2026/10/18
+#
+import hmac
+import asyncio
+import logging
+
+from aiohttp import web
+
+from config import Config
+
+
+log = logging.getLogger('TeachTime Webhook')
+SECRET_HEADER = 'X-Telegram-Bot-Api-Secret-Token'
+
+
+class InflightUpdates:
+    '''InflightUpdates: counts webhook requests in processing.
+    aiohttp calls on_shutdown before it waits for running handlers, so shutdown waits them by this counter.
+    '''
+    def __init__(self):
+        self.count = 0
+        self.idle = asyncio.Event()
+        self.idle.set()
+
+    def enter(self) -> None:
+        '''enter: counts started request.
+        '''
+        self.count += 1
+        self.idle.clear()
+
+    def leave(self) -> None:
+        '''leave: counts finished request.
+        '''
+        self.count -= 1
+        if self.count == 0:
+            self.idle.set()
+
+    async def wait(self, timeout: float) -> bool:
+        '''wait: waits for all requests in processing to finish.
+
+        Args:
+            timeout (float): seconds to wait.
+
+        Returns:
+            bool: True if no requests left, False on timeout.
+        '''
+        try:
+            await asyncio.wait_for(self.idle.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+
+def getWebApp(conf: Config) -> web.Application:
+    '''getWebApp: returns aiohttp app for webhook, requests to webhook path without valid secret token are rejected.
+
+    Args:
+        conf (Config): TeachTime config instance.
+
+    Returns:
+        web.Application: aiohttp application, webhook route is added by aiogram executor.
+            Webhook requests in processing are counted by app["inflight"] (InflightUpdates).
+    '''
+    secret = conf.WEBHOOK_SECRET.encode()
+    inflight = InflightUpdates()
+
+    @web.middleware
+    async def checkSecret(request: web.Request, handler):
+        if request.path == conf.WEBHOOK_PATH:
+            token = request.headers.get(SECRET_HEADER, '').encode()
+            if not hmac.compare_digest(token, secret):
+                log.warning(f'Rejected webhook request from {request.remote}: bad secret token.')
+                raise web.HTTPUnauthorized()
+            inflight.enter()
+            try:
+                return await handler(request)
+            finally:
+                inflight.leave()
+        return await handler(request)
+
+    app = web.Application(middlewares=[checkSecret])
+    app['inflight'] = inflight
+    return app
@@ -0,0 +1,566 @@
+# -*- coding: utf-8 -*-
+#
+#  TeachTime module "zamena".
+#  Created by LulzLoL231 at 2026/10/18
+#
+import os
+import re
+import json
+import shutil
+import asyncio
+import hashlib
+import logging
+import signal
+import typing
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import aiohttp
+import aiofiles
+from pdf2image import convert_from_path, pdfinfo_from_path
+
+from config import Config
+
+
+# zamena table cells, "pdftotext -layout" keeps columns separated by 2+ spaces.
+COLUMNS_RE = re.compile(r'\s{2,}')
+DATE_RE = re.compile(r'(\d{1,2})\.(\d{1,2})\.(\d{4})')
+PAIR_RE = re.compile(r'^[1-9](?:\s*[,-]\s*[1-9])*$')
+TEACHER_RE = re.compile(r'[А-ЯЁ][а-яё]+(?:-[А-ЯЁ][а-яё]+)?\s+[А-ЯЁ]\.\s?[А-ЯЁ]\.?')
+ROOM_RE = re.compile(r'^(?:ауд\.?\s*)?(?:\d{1,4}[а-яА-Я]?|с/з|спортзал|дист\.?)$', re.I)
+GROUP_SEP_RE = re.compile(r'[\s-]')  # group name is compared without spaces and dashes, "ИС-21" == "ИС 21"
+CANCELLED = ('снята', 'снято', 'отмена', 'нет', '-', '—')
+
+
+class ZamenaError(Exception):
+    '''ZamenaError: zamena PDF can't be fetched or rendered.'''
+
+
+def parsePairs(cell: str) -> typing.List[int]:
+    '''parsePairs: parses pairs cell like "2", "2,3" or "2-4".
+
+    Args:
+        cell (str): table cell.
+
+    Returns:
+        typing.List[int]: pairs numbers.
+    '''
+    pairs = []
+    for part in cell.replace(' ', '').split(','):
+        start, _, end = part.partition('-')
+        pairs.extend(range(int(start), int(end or start) + 1))
+    return pairs
+
+
+def parseZamena(text: str, group: str) -> typing.List[dict]:
+    '''parseZamena: parses zamena text layer into group replacements.
+
+    Row what starts with group name begins group rows, next rows what
+    starts with pair number continues it, row of other group ends it.
+    Replacement date is the last date found above rows. Row cells are:
+    pairs, lessons (replacement is the last one), teacher and room, teacher
+    and room are optional.
+
+    Args:
+        text (str): "pdftotext -layout" output.
+        group (str): group name.
+
+    Returns:
+        typing.List[dict]: records with "date", "type", "name" (None if pair is cancelled), "teacher" and "room" keys.
+    '''
+    group = GROUP_SEP_RE.sub('', group).lower()
+    records = []
+    date = None
+    in_group = False
+    for line in text.splitlines():
+        cells = [i for i in COLUMNS_RE.split(line.strip()) if i]
+        if not cells:
+            continue
+        if GROUP_SEP_RE.sub('', cells[0]).lower() == group:
+            in_group = True
+            cells = cells[1:]
+        elif not PAIR_RE.match(cells[0]):
+            found = DATE_RE.search(line)
+            if found:
+                day, month, year = found.groups()
+                date = f'{year}-{int(month):02d}-{int(day):02d}'
+            in_group = False
+            continue
+        if not in_group or not date or not cells or not PAIR_RE.match(cells[0]):
+            continue
+        pairs, rest = parsePairs(cells[0]), cells[1:]
+        room = rest.pop() if rest and ROOM_RE.match(rest[-1]) else None
+        teacher = None
+        for num in range(len(rest) - 1, -1, -1):
+            found = TEACHER_RE.search(rest[num])
+            if found:
+                teacher = found.group()
+                # teacher can be in lesson cell, when columns are too close.
+                lesson = rest[num][:found.start()].strip()
+                rest = rest[:num] + ([lesson] if lesson else [])
+                break
+        name = rest[-1] if rest else None
+        if name and name.lower() in CANCELLED:
+            name = None
+        records.extend({'date': date, 'type': i, 'name': name, 'teacher': teacher, 'room': room} for i in pairs)
+    return records
+
+
+def limitMemory(limit: int) -> None:
+    '''limitMemory: caps address space of render worker and poppler, started by it. Runs in worker process.
+
+    Args:
+        limit (int): limit, MB. 0 is no limit.
+    '''
+    import resource
+    if limit:
+        hard = resource.getrlimit(resource.RLIMIT_AS)[1]
+        resource.setrlimit(resource.RLIMIT_AS, (limit * 1024 * 1024, hard))
+
+
+def initWorker(limit: int, pids) -> None:
+    '''initWorker: render worker initializer, reports worker PID, so stuck worker can be killed, and caps its memory.
+
+    Args:
+        limit (int): memory limit, MB. 0 is no limit.
+        pids (multiprocessing.SimpleQueue): queue of workers PIDs.
+    '''
+    pids.put(os.getpid())
+    limitMemory(limit)
+
+
+def encodePage(img, fp: typing.Union[str, typing.BinaryIO], profile: dict) -> None:
+    '''encodePage: encodes rendered page by encoding profile.
+
+    Args:
+        img (PIL.Image.Image): rendered page.
+        fp (typing.Union[str, typing.BinaryIO]): output path or file.
+        profile (dict): encoding profile, like conf.ZAMENA_PROFILES values.
+    '''
+    max_size = profile.get('max_size')
+    if max_size and max(img.size) > max_size:
+        img.thumbnail((max_size, max_size))
+    mode = profile.get('mode', 'RGB')
+    if mode == 'P':
+        img = img.convert('L').quantize(profile.get('colors', 16))
+    elif mode == '1':
+        # no dithering, text edges stays sharp.
+        img = img.convert('L').convert('1', dither=0)
+    elif img.mode != mode:
+        img = img.convert(mode)
+    if profile.get('format', 'JPEG') == 'PNG':
+        img.save(fp, 'PNG', optimize=True)
+    else:
+        img.save(fp, 'JPEG', quality=profile.get('quality', 75), progressive=profile.get('progressive', False),
+                 optimize=True)
+
+
+def renderPdf(path: str, pages_dir: str, profile: dict, timeout: int) -> int:
+    '''renderPdf: renders PDF to image files one page at a time, so only one page is in memory. Runs in worker process.
+
+    Args:
+        path (str): PDF path.
+        pages_dir (str): output directory, page N is saved as "N.jpg" or "N.png" (from 0).
+        profile (dict): encoding profile, like conf.ZAMENA_PROFILES values.
+        timeout (int): poppler timeout per call, seconds.
+
+    Returns:
+        int: pages count.
+    '''
+    count = pdfinfo_from_path(path, timeout=timeout)['Pages']
+    ext = 'png' if profile.get('format', 'JPEG') == 'PNG' else 'jpg'
+    os.makedirs(pages_dir, exist_ok=True)
+    for num in range(1, count + 1):
+        img = convert_from_path(path, profile['dpi'], first_page=num, last_page=num, timeout=timeout,
+                                grayscale=profile.get('mode', 'RGB') != 'RGB')[0]
+        encodePage(img, os.path.join(pages_dir, f'{str(num - 1)}.{ext}'), profile)
+        img.close()
+    return count
+
+
+class Zamena:
+    '''Zamena: replacements PDF with on-disk cache.
+
+    Last fetched PDF is kept in conf.ZAMENA_DIR with its ETag and
+    Last-Modified, so next fetch is conditional GET and 304 answer
+    reuses cached PDF. Rendered pages are kept per PDF hash and encoding
+    profile (conf.ZAMENA_PROFILE), and pages hashes are kept in DB, so
+    pages already uploaded to Telegram are known without rendering.
+
+    PDF is polled every conf.ZAMENA_INTERVAL by supervised "zamena" task,
+    new PDF is rendered in background, so sending reads only prepared pages.
+
+    Args:
+        conf (Config): TeachTime config instance.
+        db (Database): TeachTime database instance.
+        http (HttpClient): TeachTime HTTP client instance.
+    '''
+    def __init__(self, conf: Config, db, http):
+        self.db = db
+        self.http = http
+        self.url = conf.ZAMENA_URL
+        self.dir = conf.ZAMENA_DIR
+        self.profile_name = conf.ZAMENA_PROFILE
+        self.profile = conf.ZAMENA_PROFILES[conf.ZAMENA_PROFILE]
+        self.workers = conf.ZAMENA_WORKERS
+        self.render_timeout = conf.ZAMENA_RENDER_TIMEOUT
+        self.memory_limit = conf.ZAMENA_MEMORY_LIMIT
+        self.pool = None  # render processes pool, opened on first render
+        self.pids = None  # multiprocessing.SimpleQueue of pool workers PIDs
+        self.render_sem = asyncio.Semaphore(conf.ZAMENA_WORKERS)  # renders running at once
+        self.renders = {}  # PDF sha256 -> render task, shared by concurrent getPages
+        self.pdf_path = os.path.join(self.dir, 'zamena.pdf')
+        self.meta_path = os.path.join(self.dir, 'zamena.json')
+        self.meta = None  # etag, last_modified and sha256 of cached PDF, loaded on first use
+        self.interval = conf.ZAMENA_INTERVAL
+        self.group = conf.ZAMENA_GROUP
+        self.ready = None  # sha256, replacements or pages hashes and paths of last prepared PDF
+        self.work = False
+        self.wakeup = None
+        self.log = logging.getLogger('TeachTime Zamena')
+
+    async def loadMeta(self) -> dict:
+        '''loadMeta: returns cached PDF meta, reads it from disk on first call.
+
+        Returns:
+            dict: meta, empty if PDF is not cached.
+        '''
+        if self.meta is None:
+            self.meta = {}
+            if os.path.exists(self.meta_path) and os.path.exists(self.pdf_path):
+                try:
+                    async with aiofiles.open(self.meta_path) as f:
+                        self.meta = json.loads(await f.read())
+                except (OSError, ValueError) as e:
+                    self.log.warning(f'loadMeta: cache meta is broken: {str(e)}')
+        return self.meta
+
+    async def writeFile(self, path: str, data: typing.Union[bytes, str]) -> None:
+        '''writeFile: writes file atomically.
+
+        Args:
+            path (str): file path.
+            data (typing.Union[bytes, str]): file content.
+        '''
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        async with aiofiles.open(path + '.tmp', 'wb' if isinstance(data, bytes) else 'w') as f:
+            await f.write(data)
+        os.replace(path + '.tmp', path)
+
+    async def fetch(self) -> bool:
+        '''fetch: conditional GET of zamena PDF, new PDF replaces cached one.
+
+        Raises:
+            ZamenaError: download failed.
+
+        Returns:
+            bool: True if PDF is changed since last fetch.
+        '''
+        meta = await self.loadMeta()
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        try:
+            async with self.http.get(self.url, headers=headers) as resp:
+                if resp.status == 304:
+                    self.log.debug('fetch: not modified.')
+                    return False
+                if resp.status != 200:
+                    raise ZamenaError(f'HTTP {str(resp.status)}')
+                data = await resp.read()
+                etag, last_modified = resp.headers.get('ETag'), resp.headers.get('Last-Modified')
+        except asyncio.TimeoutError as e:
+            raise ZamenaError('timeout') from e
+        except aiohttp.ClientError as e:
+            raise ZamenaError(str(e)) from e
+        sha = hashlib.sha256(data).hexdigest()
+        changed = sha != meta.get('sha256')
+        if changed:
+            await self.writeFile(self.pdf_path, data)
+            self.log.info(f'fetch: new zamena {sha[:12]}, {str(len(data))} bytes.')
+        self.meta = {'etag': etag, 'last_modified': last_modified, 'sha256': sha}
+        await self.writeFile(self.meta_path, json.dumps(self.meta))
+        return changed
+
+    async def getPdf(self) -> bytes:
+        '''getPdf: returns cached PDF.
+
+        Returns:
+            bytes: PDF content.
+        '''
+        async with aiofiles.open(self.pdf_path, 'rb') as f:
+            return await f.read()
+
+    async def extractText(self) -> str:
+        '''extractText: returns text layer of cached PDF by "pdftotext -layout".
+
+        Raises:
+            ZamenaError: pdftotext failed.
+
+        Returns:
+            str: PDF text.
+        '''
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                'pdftotext', '-layout', '-enc', 'UTF-8', self.pdf_path, '-',
+                stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+        except OSError as e:
+            raise ZamenaError(f'pdftotext: {str(e)}') from e
+        try:
+            out, err = await asyncio.wait_for(proc.communicate(), self.render_timeout)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            raise ZamenaError(f'pdftotext: timeout {str(self.render_timeout)} sec.')
+        if proc.returncode:
+            raise ZamenaError(f'pdftotext: {err.decode(errors="replace").strip()}')
+        return out.decode(errors='replace')
+
+    async def getRecords(self) -> typing.List[dict]:
+        '''getRecords: returns group replacements parsed from cached PDF text, parsed once per PDF.
+
+        Returns:
+            typing.List[dict]: records like parseZamena, empty if PDF has no text layer or group rows.
+        '''
+        sha = self.meta['sha256']
+        records = await self.db.getZamenaRecords(sha)
+        if records is None:
+            try:
+                records = parseZamena(await self.extractText(), self.group)
+            except ZamenaError as e:
+                self.log.warning(f'getRecords: text extraction failed: {str(e)}')
+                return []
+            await self.db.setZamenaRecords(sha, records)
+            self.log.info(f'getRecords: parsed {str(len(records))} replacements.')
+        return records
+
+    def getPagesKey(self, sha: str) -> str:
+        '''getPagesKey: returns rendered pages key of PDF, pages are rendered again when encoding profile is changed.
+
+        Args:
+            sha (str): PDF sha256.
+
+        Returns:
+            str: pages key.
+        '''
+        return f'{sha}-{self.profile_name}'
+
+    def getPagesDir(self, sha: str) -> str:
+        '''getPagesDir: returns directory of rendered pages of PDF.
+
+        Args:
+            sha (str): PDF sha256.
+
+        Returns:
+            str: directory path.
+        '''
+        return os.path.join(self.dir, 'pages', self.getPagesKey(sha))
+
+    async def update(self) -> bool:
+        '''update: fetches PDF, cached PDF is used if fetch failed.
+
+        Raises:
+            ZamenaError: download failed and there is no cached PDF.
+
+        Returns:
+            bool: True if PDF is changed since last fetch.
+        '''
+        try:
+            return await self.fetch()
+        except ZamenaError as e:
+            if not self.meta.get('sha256'):
+                raise
+            self.log.warning(f'update: fetch failed, using cached zamena: {str(e)}')
+            return False
+
+    async def getPagePaths(self) -> typing.List[str]:
+        '''getPagePaths: returns pages images paths of cached PDF, PDF is rendered if its pages are not on disk.
+
+        Raises:
+            ZamenaError: render failed.
+
+        Returns:
+            typing.List[str]: pages paths in pages order.
+        '''
+        sha = self.meta['sha256']
+        pages_dir = self.getPagesDir(sha)
+        if not os.path.isdir(pages_dir):
+            if sha not in self.renders:
+                # concurrent calls waits for the same render.
+                self.renders[sha] = asyncio.ensure_future(self.renderPages(pages_dir))
+                self.renders[sha].add_done_callback(lambda _: self.renders.pop(sha, None))
+            await asyncio.shield(self.renders[sha])
+        names = sorted(os.listdir(pages_dir), key=lambda i: int(i.split('.')[0]))
+        return [os.path.join(pages_dir, i) for i in names]
+
+    async def renderPages(self, pages_dir: str) -> None:
+        '''renderPages: renders cached PDF into pages dir.
+
+        Args:
+            pages_dir (str): pages directory.
+
+        Raises:
+            ZamenaError: render failed.
+        '''
+        # pages dir appears only when all pages are written.
+        shutil.rmtree(pages_dir + '.tmp', ignore_errors=True)
+        count = await self.render(pages_dir + '.tmp')
+        os.replace(pages_dir + '.tmp', pages_dir)
+        self.log.info(f'renderPages: rendered {str(count)} pages.')
+
+    async def render(self, pages_dir: str) -> int:
+        '''render: renders cached PDF in worker process, within ZAMENA_RENDER_TIMEOUT and ZAMENA_MEMORY_LIMIT.
+
+        Args:
+            pages_dir (str): output directory.
+
+        Raises:
+            ZamenaError: render failed or timed out.
+
+        Returns:
+            int: pages count.
+        '''
+        async with self.render_sem:
+            if self.pool is None:
+                # forked worker would inherit bot threads and sockets, so workers starts clean.
+                method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+                context = multiprocessing.get_context(method)
+                self.pids = context.SimpleQueue()
+                self.pool = ProcessPoolExecutor(
+                    self.workers, mp_context=context, initializer=initWorker, initargs=(self.memory_limit, self.pids))
+            fut = asyncio.get_event_loop().run_in_executor(
+                self.pool, renderPdf, self.pdf_path, pages_dir, self.profile, self.render_timeout)
+            try:
+                return await asyncio.wait_for(fut, self.render_timeout)
+            except asyncio.TimeoutError:
+                # stuck worker keeps its process busy, so pool is replaced.
+                self.close()
+                raise ZamenaError(f'render: timeout {str(self.render_timeout)} sec.')
+            except BrokenProcessPool as e:
+                self.close()
+                raise ZamenaError(f'render: worker died: {str(e)}') from e
+            except MemoryError as e:
+                raise ZamenaError(f'render: memory limit {str(self.memory_limit)} MB exceeded.') from e
+            except Exception as e:
+                raise ZamenaError(f'render: {str(e)}') from e
+
+    def close(self) -> None:
+        '''close: kills render processes.
+        '''
+        if self.pool is None:
+            return
+        pool, self.pool = self.pool, None
+        pool.shutdown(wait=False, cancel_futures=True)
+        # stuck worker never exits by shutdown, so workers are killed by PIDs they reported.
+        while not self.pids.empty():
+            try:
+                os.kill(self.pids.get(), signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        self.pids.close()
+        self.pids = None
+
+    async def getPageHashes(self) -> typing.List[str]:
+        '''getPageHashes: returns pages hashes of cached PDF, PDF is rendered only if its pages are not known.
+
+        Raises:
+            ZamenaError: render failed.
+
+        Returns:
+            typing.List[str]: pages sha256 in pages order.
+        '''
+        key = self.getPagesKey(self.meta['sha256'])
+        hashes = await self.db.getZamenaPages(key)
+        if not hashes:
+            for path in await self.getPagePaths():
+                async with aiofiles.open(path, 'rb') as f:
+                    hashes.append(hashlib.sha256(await f.read()).hexdigest())
+            await self.db.setZamenaPages(key, hashes)
+        return hashes
+
+    def cleanPages(self, sha: str) -> None:
+        '''cleanPages: removes rendered pages of other PDFs.
+
+        Args:
+            sha (str): PDF sha256 what pages are kept.
+        '''
+        pages_root = os.path.join(self.dir, 'pages')
+        if not os.path.isdir(pages_root):
+            return
+        for name in os.listdir(pages_root):
+            if name != self.getPagesKey(sha):
+                shutil.rmtree(os.path.join(pages_root, name), ignore_errors=True)
+
+    async def prefetch(self) -> bool:
+        '''prefetch: fetches PDF and prepares it, if it's not prepared yet.
+        PDF is rendered only if group replacements can't be read from its text.
+
+        Raises:
+            ZamenaError: fetch or render failed.
+
+        Returns:
+            bool: True if PDF is changed since last fetch.
+        '''
+        changed = await self.update()
+        sha = self.meta['sha256']
+        if self.ready is None or self.ready['sha256'] != sha:
+            records = await self.getRecords()
+            if records:
+                self.ready = {'sha256': sha, 'records': records, 'hashes': None, 'paths': None}
+            else:
+                paths = await self.getPagePaths()
+                hashes = await self.getPageHashes()
+                # previous pages are kept until new ones are ready.
+                self.ready = {'sha256': sha, 'records': None, 'hashes': hashes, 'paths': paths}
+            self.cleanPages(sha)
+            self.log.info(f'prefetch: zamena {sha[:12]} is ready, '
+                          + (f'{str(len(records))} replacements.' if records else f'{str(len(paths))} pages.'))
+        return changed
+
+    async def getChangedPages(self, chat_id: int) -> typing.List[int]:
+        '''getChangedPages: returns prepared pages what chat has not received yet.
+        Pages are compared by content hash, so page what looks the same in new PDF is not sent again.
+
+        Args:
+            chat_id (int): telegram chat id.
+
+        Returns:
+            typing.List[int]: pages numbers (from 0), all pages if zamena was not sent to chat.
+        '''
+        hashes = self.ready['hashes']
+        last = await self.db.getZamenaSent(chat_id)
+        if last is None:
+            return list(range(len(hashes)))
+        if last == self.ready['sha256']:
+            return []
+        sent = set(await self.db.getZamenaPages(self.getPagesKey(last)))
+        return [num for num, i in enumerate(hashes) if i not in sent]
+
+    def stop(self) -> None:
+        '''stop: stops prefetch loop.
+        '''
+        self.work = False
+        if self.wakeup:
+            self.wakeup.set()
+
+    async def main(self) -> None:
+        '''main: prefetch loop, returns after stop. Runs as supervised "zamena" task.
+        '''
+        self.work = True
+        self.wakeup = asyncio.Event()
+        try:
+            while self.work:
+                try:
+                    await self.prefetch()
+                except ZamenaError as e:
+                    self.log.warning(f'main: prefetch failed: {str(e)}')
+                self.wakeup.clear()
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), self.interval)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self.work = False